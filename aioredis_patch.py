@@ -6,6 +6,7 @@ Import this module before any other imports in main.py.
 
 import sys
 import logging
+import re
 import importlib.util
 import importlib.abc
 
@@ -14,6 +15,11 @@ logger = logging.getLogger(__name__)
 # Flag to track if patch has been applied
 _patched = False
 
+# Matches the TimeoutError class statement that lists both asyncio.TimeoutError
+# and builtins.TimeoutError as bases, which are the same class on Python 3.11+
+_AIOREDIS_TIMEOUTERR_RE = re.compile(
+    r'(class TimeoutError\([^)]*?)asyncio\.TimeoutError, builtins\.TimeoutError([^)]*\))')
+
 
 class AioredisImportFinder(importlib.abc.MetaPathFinder):
     """Custom import finder for aioredis module to patch TimeoutError"""
@@ -22,19 +28,23 @@ class AioredisImportFinder(importlib.abc.MetaPathFinder):
         self._original_import = __import__
 
     def find_spec(self, fullname, path, target=None):
-        if fullname == 'aioredis.exceptions' or fullname.startswith('aioredis.'):
-            # Get the original spec
-            for finder in sys.meta_path:
-                if finder is self:
-                    continue
-                spec = finder.find_spec(fullname, path, target)
-                if spec is not None:
-                    # Create our custom loader
-                    if spec.loader and fullname == 'aioredis.exceptions':
-                        original_loader = spec.loader
-                        spec.loader = AioredisExceptionsLoader(original_loader)
-                    return spec
-        return None
+        # Only aioredis.exceptions needs patching; let the regular import
+        # machinery handle every other module without any extra work
+        if fullname != 'aioredis.exceptions':
+            return None
+
+        # Delegate the lookup once, with ourselves removed from meta_path
+        # so the call does not recurse back into this finder
+        sys.meta_path.remove(self)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            sys.meta_path.insert(0, self)
+
+        if spec is not None and spec.loader:
+            # Create our custom loader
+            spec.loader = AioredisExceptionsLoader(spec.loader)
+        return spec
 
 
 class AioredisExceptionsLoader:
@@ -48,34 +58,33 @@ class AioredisExceptionsLoader:
         return self.original_loader.create_module(spec)
 
     def exec_module(self, module):
-        # First, let the original loader execute the module
+        # Get the source code from the original module file
+        source = None
+        try:
+            if hasattr(self.original_loader, 'get_source'):
+                source = self.original_loader.get_source(module.__name__)
+        except Exception as e:
+            logger.warning(f"Could not read aioredis.exceptions source: {e}")
+
+        if source and 'builtins.TimeoutError' not in source:
+            # This aioredis release doesn't have the duplicate base,
+            # so there is nothing to rewrite or compile
+            self.original_loader.exec_module(module)
+            return
+
         try:
             # Instead of running the original exec_module, we'll manually control the execution
             # to intercept the TimeoutError class definition
-            import asyncio
-            import sys
+            if source:
+                # Modify the source code to fix TimeoutError definition,
+                # using only asyncio.TimeoutError as a base class
+                modified_source = _AIOREDIS_TIMEOUTERR_RE.sub(
+                    r'\1asyncio.TimeoutError\2', source)
 
-            # Get the source code from the original module file
-            spec = self.original_loader.get_resource_reader(module.__name__)
-            source = None
-            if hasattr(spec, 'get_source'):
-                source = spec.get_source(module.__name__)
+                # Compile the modified code
+                code = compile(modified_source, module.__file__, 'exec')
 
-            if source:
-                # Modify the source code to fix TimeoutError definition
-                source_lines = source.split('\n')
-                modified_source = []
-                for line in source_lines:
-                    # Replace the problematic TimeoutError definition
-                    if 'class TimeoutError(' in line and 'asyncio.TimeoutError' in line and 'builtins.TimeoutError' in line:
-                        # Use only asyncio.TimeoutError as a base class
-                        line = line.replace(
-                            'asyncio.TimeoutError, builtins.TimeoutError', 'asyncio.TimeoutError')
-                    modified_source.append(line)
-
-                # Compile and execute the modified code
-                code = compile('\n'.join(modified_source),
-                               module.__file__, 'exec')
+                # Execute the patched code
                 exec(code, module.__dict__)
                 logger.info(
                     "Applied patch to aioredis.exceptions: fixed TimeoutError definition")
@@ -90,16 +99,17 @@ class AioredisExceptionsLoader:
         # Now patch it
         try:
             import asyncio
+            import builtins
 
-            # Check if we're in Python 3.11+ where builtins.TimeoutError and asyncio.TimeoutError are the same
-            if sys.version_info >= (3, 11) and hasattr(module, 'TimeoutError'):
+            # Only rewrite the class when it actually carries the duplicate
+            # builtins.TimeoutError base (upstream fixes won't need this)
+            timeout_error = getattr(module, 'TimeoutError', None)
+            if timeout_error is not None and builtins.TimeoutError in timeout_error.__bases__:
                 logger.info(
                     "Applying aioredis TimeoutError patch for Python 3.11+")
 
                 # Get the RedisError class
-                redis_error_class = None
-                if hasattr(module, 'RedisError'):
-                    redis_error_class = module.RedisError
+                redis_error_class = getattr(module, 'RedisError', None)
 
                 # Create a new TimeoutError class with only asyncio.TimeoutError as base
                 if redis_error_class:
@@ -111,9 +121,11 @@ class AioredisExceptionsLoader:
                     class PatchedTimeoutError(asyncio.TimeoutError):
                         pass
 
-                # Store the original docstring and attributes
-                if hasattr(module.TimeoutError, '__doc__'):
-                    PatchedTimeoutError.__doc__ = module.TimeoutError.__doc__
+                # Store the original docstring and naming
+                PatchedTimeoutError.__doc__ = timeout_error.__doc__
+                PatchedTimeoutError.__module__ = timeout_error.__module__
+                PatchedTimeoutError.__qualname__ = timeout_error.__qualname__
+                PatchedTimeoutError.__name__ = timeout_error.__name__
 
                 # Replace the TimeoutError class
                 module.TimeoutError = PatchedTimeoutError
@@ -131,6 +143,18 @@ def apply_aioredis_patch():
     if _patched:
         return
 
+    # The duplicate base class only breaks on Python 3.11+, where
+    # asyncio.TimeoutError is an alias of builtins.TimeoutError
+    if sys.version_info < (3, 11):
+        _patched = True
+        return
+
+    # Nothing to patch if aioredis isn't installed. find_spec only locates
+    # the package, it does not execute it.
+    if importlib.util.find_spec('aioredis') is None:
+        logger.debug("aioredis not installed, skipping import hook")
+        return
+
     try:
         # Install our finder at the beginning of meta_path
         finder = AioredisImportFinder()
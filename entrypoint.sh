@@ -36,6 +36,11 @@ else
     exit 1
 fi
 
-# Start the application
+# Start the application on uvloop/httptools; auto-reload only in development
+UVICORN_ARGS="--loop uvloop --http httptools"
+if [ "$DEV" = "1" ]; then
+    UVICORN_ARGS="$UVICORN_ARGS --reload"
+fi
+
 echo -e "\n=== Starting Application ==="
-exec python -m uvicorn src.main:app --host 0.0.0.0 --port 8008 --reload
\ No newline at end of file
+exec python -m uvicorn src.main:app --host 0.0.0.0 --port 8008 $UVICORN_ARGS
\ No newline at end of file
@@ -13,4 +13,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 if __name__ == "__main__":
     # Run the server with proper path configuration
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8008, reload=True)
\ No newline at end of file
+    uvicorn.run("src.main:app", host="0.0.0.0", port=8008,
+                loop="uvloop", http="httptools",
+                reload=os.environ.get("DEV") == "1")
\ No newline at end of file
@@ -3,129 +3,292 @@ Simplified Master Sync server focused only on the sync endpoints.
 This server provides the necessary endpoints for the remote calendar agent without any dependencies on Redis.
 """
 
+import asyncio
 import logging
 import os
 import sys
+import time
 import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, Optional
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+
+from static_cors import StaticCORSMiddleware
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory storage for agents
-agents = {}
+
+@dataclass(slots=True)
+class Agent:
+    """A registered calendar agent.
+
+    Timestamps are stored as epoch seconds and formatted to ISO only when
+    returned to a client.
+    """
+    id: str
+    name: Any
+    version: Any
+    location: Any
+    capabilities: Any
+    registered_at: float
+    last_heartbeat: float
+    status: Any = None
+    metrics: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the client-facing dict for this agent"""
+        record = {
+            "id": self.id,
+            "name": self.name,
+            "version": self.version,
+            "location": self.location,
+            "capabilities": self.capabilities,
+            "registered_at": _iso(self.registered_at),
+            "last_heartbeat": _iso(self.last_heartbeat)
+        }
+        if self.status is not None:
+            record["status"] = self.status
+        if self.metrics is not None:
+            record["metrics"] = self.metrics
+        return record
+
+
+# In-memory storage for agents, keyed by their raw 16-byte UUID and
+# exposed to clients as hex
+agents: Dict[bytes, Agent] = {}
+
+# Serialised /sync/agents body, rebuilt lazily after any agent changes
+_agents_cache_bytes: Optional[bytes] = None
+
+# Agents that haven't sent a heartbeat within AGENT_TTL seconds are dropped
+# by a background task every REAPER_INTERVAL seconds
+AGENT_TTL = int(os.environ.get("AGENT_TTL", 300))
+REAPER_INTERVAL = int(os.environ.get("AGENT_REAPER_INTERVAL", 30))
+
+# Heartbeats are logged per request at DEBUG only; INFO gets a periodic
+# summary of how many arrived in the last HEARTBEAT_LOG_INTERVAL seconds
+HEARTBEAT_LOG_INTERVAL = 10
+_heartbeat_count = 0
+
+# Static server description served from /
+_ROOT_JSON = orjson.dumps({
+    "name": "Master Sync Server",
+    "version": "1.0",
+    "description": "Calendar Sync Master Server",
+    "endpoints": [
+        "/sync/agents",
+        "/sync/agents/{agent_id}",
+        "/sync/agents/{agent_id}/heartbeat",
+        "/health"
+    ]
+})
+
+
+def _iso(ts: float) -> str:
+    """Format an epoch timestamp as a naive UTC ISO string"""
+    return datetime.utcfromtimestamp(ts).isoformat()
+
+
+def _get_agent(agent_id: str) -> Optional[Agent]:
+    """Look up an agent from its hex or canonical UUID string"""
+    try:
+        key = uuid.UUID(agent_id).bytes
+    except ValueError:
+        return None
+    return agents.get(key)
+
+
+def _remove_stale_agents(cutoff: float) -> int:
+    """Drop agents whose last heartbeat is older than cutoff"""
+    global _agents_cache_bytes
+
+    stale = [key for key, agent in agents.items() if agent.last_heartbeat < cutoff]
+    for key in stale:
+        del agents[key]
+    if stale:
+        _agents_cache_bytes = None
+    return len(stale)
+
+
+async def _reap_stale_agents():
+    """Periodically remove agents that stopped sending heartbeats"""
+    while True:
+        await asyncio.sleep(REAPER_INTERVAL)
+        removed = _remove_stale_agents(time.time() - AGENT_TTL)
+        if removed:
+            logger.info("Removed %d stale agents", removed)
+
+
+async def _log_heartbeat_summary():
+    """Periodically log how many heartbeats were received"""
+    global _heartbeat_count
+    while True:
+        await asyncio.sleep(HEARTBEAT_LOG_INTERVAL)
+        if _heartbeat_count:
+            logger.info("Received %d heartbeats from %d agents in the last %ds",
+                        _heartbeat_count, len(agents), HEARTBEAT_LOG_INTERVAL)
+            _heartbeat_count = 0
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the stale agent reaper and heartbeat logger for the lifetime of the server"""
+    tasks = [
+        asyncio.create_task(_reap_stale_agents()),
+        asyncio.create_task(_log_heartbeat_summary())
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+
 
 # Create FastAPI app
-app = FastAPI(title="Master Sync Server", description="Calendar Sync Master Server")
-
-# Set up CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+app = FastAPI(
+    title="Master Sync Server",
+    description="Calendar Sync Master Server",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Set up CORS (all origins allowed, so the headers are precomputed)
+app.add_middleware(StaticCORSMiddleware)
+
+
+# Fields are typed Any so any JSON value an agent sends is accepted and
+# stored as is, as it was when the payloads were read as plain dicts
+
+
+class AgentIn(BaseModel):
+    """Registration payload sent by a calendar agent"""
+    model_config = ConfigDict(extra="ignore")
+
+    name: Any = "Unknown Agent"
+    version: Any = "1.0"
+    location: Any = "Unknown"
+    capabilities: Any = []
+
+
+class HeartbeatIn(BaseModel):
+    """Heartbeat payload sent by a calendar agent"""
+    model_config = ConfigDict(extra="ignore")
+
+    status: Any = None
+    metrics: Any = None
+
+
 # Sync API routes
-@app.post("/sync/agents", status_code=201)
-async def register_agent(agent_data: dict):
+@app.post("/sync/agents", status_code=201, response_model=None)
+async def register_agent(agent_data: AgentIn):
     """
     Register a new calendar agent.
     """
-    agent_id = str(uuid.uuid4())
-    timestamp = datetime.utcnow().isoformat()
-    
-    agents[agent_id] = {
-        "id": agent_id,
-        "name": agent_data.get("name", "Unknown Agent"),
-        "version": agent_data.get("version", "1.0"),
-        "location": agent_data.get("location", "Unknown"),
-        "capabilities": agent_data.get("capabilities", []),
-        "registered_at": timestamp,
-        "last_heartbeat": timestamp
-    }
-    
-    logger.info(f"Agent registered: {agent_id}")
-    return {
+    global _agents_cache_bytes
+
+    aid = uuid.uuid4()
+    agent_id = aid.hex
+    now = time.time()
+
+    agents[aid.bytes] = Agent(
+        id=agent_id,
+        name=agent_data.name,
+        version=agent_data.version,
+        location=agent_data.location,
+        capabilities=agent_data.capabilities,
+        registered_at=now,
+        last_heartbeat=now
+    )
+    _agents_cache_bytes = None
+
+    logger.info("Agent registered: %s", agent_id)
+    return ORJSONResponse({
         "agent_id": agent_id,
         "status": "registered",
-        "timestamp": timestamp
-    }
+        "timestamp": _iso(now)
+    }, status_code=201)
 
-@app.post("/sync/agents/{agent_id}/heartbeat")
-async def agent_heartbeat(agent_id: str, heartbeat_data: dict):
+@app.post("/sync/agents/{agent_id}/heartbeat", response_model=None)
+async def agent_heartbeat(agent_id: str, heartbeat_data: HeartbeatIn):
     """
     Process a heartbeat from a calendar agent.
     """
-    if agent_id not in agents:
+    global _agents_cache_bytes, _heartbeat_count
+
+    agent = _get_agent(agent_id)
+    if agent is None:
         raise HTTPException(status_code=404, detail="Agent not found")
-    
-    timestamp = datetime.utcnow().isoformat()
-    agents[agent_id]["last_heartbeat"] = timestamp
-    
+
+    now = time.time()
+    agent.last_heartbeat = now
+    _agents_cache_bytes = None
+
     # Update agent status and other fields from heartbeat data
-    if "status" in heartbeat_data:
-        agents[agent_id]["status"] = heartbeat_data["status"]
-    if "metrics" in heartbeat_data:
-        agents[agent_id]["metrics"] = heartbeat_data["metrics"]
-    
-    logger.info(f"Heartbeat received from agent: {agent_id}")
-    return {
+    sent = heartbeat_data.model_fields_set
+    if "status" in sent:
+        agent.status = heartbeat_data.status
+    if "metrics" in sent:
+        agent.metrics = heartbeat_data.metrics
+
+    _heartbeat_count += 1
+    logger.debug("Heartbeat received from agent: %s", agent_id)
+    # Agents don't read the timestamp back, so skip ISO formatting here
+    return ORJSONResponse({
         "status": "acknowledged",
-        "timestamp": timestamp
-    }
+        "ts": now
+    })
 
-@app.get("/sync/agents")
+@app.get("/sync/agents", response_model=None)
 async def list_agents():
     """
     List all registered calendar agents.
     """
-    return {"agents": list(agents.values())}
+    global _agents_cache_bytes
 
-@app.get("/sync/agents/{agent_id}")
+    if _agents_cache_bytes is None:
+        _agents_cache_bytes = orjson.dumps(
+            {"agents": [agent.to_dict() for agent in agents.values()]})
+    return Response(_agents_cache_bytes, media_type="application/json")
+
+@app.get("/sync/agents/{agent_id}", response_model=None)
 async def get_agent(agent_id: str):
     """
     Get information about a specific calendar agent.
     """
-    if agent_id not in agents:
+    agent = _get_agent(agent_id)
+    if agent is None:
         raise HTTPException(status_code=404, detail="Agent not found")
-    
-    return agents[agent_id]
 
-@app.get("/health")
+    return ORJSONResponse(agent.to_dict())
+
+@app.get("/health", response_model=None)
 async def health_check():
     """
     Health check endpoint for monitoring.
     """
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return ORJSONResponse({"status": "healthy", "timestamp": datetime.utcnow().isoformat()})
 
-@app.get("/")
+@app.get("/", response_model=None)
 async def root():
     """
     Root endpoint with basic server information.
     """
-    return {
-        "name": "Master Sync Server",
-        "version": "1.0",
-        "description": "Calendar Sync Master Server",
-        "endpoints": [
-            "/sync/agents",
-            "/sync/agents/{agent_id}",
-            "/sync/agents/{agent_id}/heartbeat",
-            "/health"
-        ]
-    }
+    return Response(_ROOT_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     port = int(os.environ.get("API_PORT", 8008))
     host = os.environ.get("API_HOST", "0.0.0.0")
     
     logger.info(f"Starting Master Sync Server on {host}:{port}")
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    uvicorn.run(app, host=host, port=port, log_level="info",
+                loop="uvloop", http="httptools",
+                access_log=os.environ.get("DEV") == "1")
@@ -5,9 +5,13 @@ For testing purposes only.
 
 import logging
 import os
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from static_cors import StaticCORSMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -16,38 +20,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Serialised /debug/routes body, built once the routes are registered
+_ROUTES_JSON = b'{"routes":[]}'
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown."""
+    global _ROUTES_JSON
+    _ROUTES_JSON = orjson.dumps({"routes": [
+        {
+            "path": route.path,
+            "name": route.name,
+            "methods": sorted(route.methods) if getattr(route, "methods", None) else None
+        }
+        for route in app.routes
+    ]})
+
+    logger.info("=== Starting Application ===")
+    logger.info("Simplified test version loaded successfully")
+    logger.info("Test sync endpoints available at /sync/agents and /sync/agents/{agent_id}/heartbeat")
+    yield
+
+
 # Create FastAPI app
-app = FastAPI(title="Calendar Service API", version="0.1.0")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for testing
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app = FastAPI(title="Calendar Service API", version="0.1.0",
+              default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Add CORS middleware (all origins allowed for testing)
+app.add_middleware(StaticCORSMiddleware)
 
 # Health check endpoint
-@app.get("/health", tags=["Health"])
+@app.get("/health", tags=["Health"], response_model=None)
 async def health_check():
     """Simple health check endpoint."""
-    return {"status": "healthy"}
+    return ORJSONResponse({"status": "healthy"})
 
 # Test sync endpoint that simulates the agent registration endpoint
-@app.post("/sync/agents", tags=["Sync Test"])
+@app.post("/sync/agents", tags=["Sync Test"], response_model=None)
 async def test_agent_registration(request: Request):
     """Test endpoint that simulates agent registration."""
     try:
-        agent_data = await request.json()
+        agent_data = orjson.loads(await request.body())
         agent_id = "test-agent-id-12345"  # Hard-coded test ID
-        logger.info(f"Test agent registration successful for: {agent_data.get('name')}")
-        return {
+        logger.info("Test agent registration successful for: %s", agent_data.get('name'))
+        return ORJSONResponse({
             "id": agent_id,
             "status": "registered",
             "message": "Agent registration successful (test endpoint)",
             "timestamp": "2025-06-07T00:00:00Z"
-        }
+        })
     except Exception as e:
         logger.error(f"Error in test registration: {e}")
         return JSONResponse(
@@ -56,18 +78,18 @@ async def test_agent_registration(request: Request):
         )
 
 # Test heartbeat endpoint
-@app.post("/sync/agents/{agent_id}/heartbeat", tags=["Sync Test"])
+@app.post("/sync/agents/{agent_id}/heartbeat", tags=["Sync Test"], response_model=None)
 async def test_agent_heartbeat(agent_id: str, request: Request):
     """Test endpoint that simulates agent heartbeat."""
     try:
-        heartbeat_data = await request.json()
-        logger.info(f"Test heartbeat received for agent: {agent_id}")
-        return {
+        heartbeat_data = orjson.loads(await request.body())
+        logger.debug("Test heartbeat received for agent: %s", agent_id)
+        return ORJSONResponse({
             "status": "success",
             "agent_id": agent_id,
             "message": "Heartbeat acknowledged (test endpoint)",
             "received_data": heartbeat_data
-        }
+        })
     except Exception as e:
         logger.error(f"Error in test heartbeat: {e}")
         return JSONResponse(
@@ -76,26 +98,14 @@ async def test_agent_heartbeat(agent_id: str, request: Request):
         )
 
 # Print application routes for debugging
-@app.get("/debug/routes", tags=["Debug"])
+@app.get("/debug/routes", tags=["Debug"], response_model=None)
 async def list_routes():
     """List all registered routes for debugging."""
-    routes = []
-    for route in app.routes:
-        routes.append({
-            "path": route.path,
-            "name": route.name,
-            "methods": route.methods if hasattr(route, "methods") else None
-        })
-    return {"routes": routes}
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Application startup event."""
-    logger.info("=== Starting Application ===")
-    logger.info("Simplified test version loaded successfully")
-    logger.info("Test sync endpoints available at /sync/agents and /sync/agents/{agent_id}/heartbeat")
+    return Response(_ROUTES_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("simplified_main:app", host="0.0.0.0", port=8008, reload=True)
+    # Auto-reload and access logging are only wanted while developing
+    dev = os.environ.get("DEV") == "1"
+    uvicorn.run("simplified_main:app", host="0.0.0.0", port=8008,
+                loop="uvloop", http="httptools", reload=dev, access_log=dev)
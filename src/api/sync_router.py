@@ -4,52 +4,154 @@ Synchronization API Router
 This module defines the API endpoints for calendar synchronization.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
-from typing import List, Dict, Any, Optional, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Body, Query
+from fastapi.responses import ORJSONResponse, Response
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union
+import asyncio
+import functools
+import hashlib
+import orjson
+import time
 import uuid
-from datetime import datetime, timedelta
+import zlib
+from datetime import datetime, timedelta, timezone
 
+from auth.google_auth import GoogleCalendarAuth
+from services.caldav_client import CalDAVClient
+from services.google_calendar import GoogleCalendarService
 from sync.architecture import (
     SyncConfiguration, SyncSource, SyncDestination, SyncAgentConfig,
     SyncDirection, SyncFrequency, SyncMethod, ConflictResolution
 )
 from sync.controller import CalendarSyncController
+from sync.event_store import AgentEvent, EventStore
 from sync.storage import SyncStorageManager
+from utils.config import settings
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Incremental JSON parsing for bulk imports, if available
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    logger.warning("ijson not available, imports will be parsed in one pass")
+    IJSON_AVAILABLE = False
+
 # Create router
-router = APIRouter(prefix="/sync", tags=["sync"])
+router = APIRouter(prefix="/sync", tags=["sync"],
+                   default_response_class=ORJSONResponse)
 
 # Dependency to get sync controller
 
+# Guards lazy creation of the shared controller when the app didn't set one up
+_controller_lock = asyncio.Lock()
+
 
-async def get_sync_controller():
-    """Create and initialize a sync controller"""
-    storage = SyncStorageManager()
-    await storage.initialize()
-    controller = CalendarSyncController(storage)
+async def get_sync_controller(request: Request) -> CalendarSyncController:
+    """Get the application-wide sync controller
+
+    The controller and its storage connection are created once at startup
+    and shared by every request. If the app hasn't set one up, it is
+    created on first use and kept on app.state.
+    """
+    controller = getattr(request.app.state, "sync_controller", None)
+    if controller is not None:
+        return controller
+
+    async with _controller_lock:
+        controller = getattr(request.app.state, "sync_controller", None)
+        if controller is None:
+            storage = SyncStorageManager()
+            await storage.initialize()
+            controller = CalendarSyncController(storage)
+            request.app.state.sync_storage = storage
+            request.app.state.sync_controller = controller
+    return controller
+
+
+async def _read_json_object(request: Request) -> Dict[str, Any]:
+    """Parse a JSON object request body as-is, without model validation
+
+    Used by the high-traffic agent endpoints whose bodies are passed on
+    untyped, where FastAPI's Body(...) validation would only copy the dict.
+    """
     try:
-        yield controller
-    finally:
-        await storage.close()
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Request body must be valid JSON"
+        )
+    if not isinstance(data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Request body must be a JSON object"
+        )
+    return data
+
+# Read-mostly GET responses carry an ETag, and clients may reuse them for a
+# few seconds without asking again
+_CACHE_CONTROL = "private, max-age=5"
+
+
+def _etag(body: bytes) -> str:
+    """
+    Weak ETag for a response body. It is weak because the compression
+    middleware may send the body as different bytes under the same tag.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    """An entity tag without its weakness indicator, for weak comparison"""
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _cacheable_json(request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """JSON response with caching headers, or a 304 if the client's copy is current"""
+    if etag is None:
+        etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored on both sides
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        opaque_tag = _opaque_tag(etag)
+        if (if_none_match.strip() == "*"
+                or opaque_tag in (_opaque_tag(tag) for tag in if_none_match.split(","))):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # Configuration endpoints
 
+# Serialised /config body, tagged with the configuration object it was built
+# from, and its ETag. read_configuration() returns a new object whenever it
+# reloads storage, after a save or once its TTL expires.
+_config_cache: Optional[Tuple[Optional[SyncConfiguration], bytes, str]] = None
+
 
 @router.get("/config")
 async def get_configuration(
+    request: Request,
     controller: CalendarSyncController = Depends(get_sync_controller)
 ):
     """Get the current synchronization configuration"""
+    global _config_cache
+
     try:
-        config = await controller.load_configuration()
-        return config.dict()
-    except ValueError:
-        # Return empty configuration if none exists
-        return SyncConfiguration().dict()
+        try:
+            config = await controller.read_configuration()
+        except ValueError:
+            # Return empty configuration if none exists
+            config = None
+        if _config_cache is None or config is None or _config_cache[0] is not config:
+            body = orjson.dumps((config or SyncConfiguration()).dict())
+            _config_cache = (config, body, _etag(body))
+        return _cacheable_json(request, _config_cache[1], _config_cache[2])
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,6 +175,17 @@ async def configure_destination(
         )
 
 
+# Fixed connection details of every Google destination. The scopes are a
+# tuple so the one shared instance can't be modified through a destination.
+_GOOGLE_CONNECTION_INFO = {
+    "api_base_url": "https://www.googleapis.com/calendar/v3",
+    "scopes": (
+        "https://www.googleapis.com/auth/calendar",
+        "https://www.googleapis.com/auth/calendar.events"
+    )
+}
+
+
 @router.post("/config/destination/google")
 async def configure_google_destination(
     data: Dict[str, Any] = Body(...),
@@ -92,13 +205,7 @@ async def configure_google_destination(
             id="google_destination",
             name="Google Calendar Destination",
             provider_type="google",
-            connection_info={
-                "api_base_url": "https://www.googleapis.com/calendar/v3",
-                "scopes": [
-                    "https://www.googleapis.com/auth/calendar",
-                    "https://www.googleapis.com/auth/calendar.events"
-                ]
-            },
+            connection_info=_GOOGLE_CONNECTION_INFO,
             credentials=credentials,
             calendar_id=calendar_id,
             conflict_resolution=ConflictResolution.LATEST_WINS,
@@ -127,19 +234,34 @@ async def configure_google_destination(
         )
 
 
+# The Google helpers hold no per-request state, so one of each is shared,
+# created on first use rather than when the router is imported
+@functools.lru_cache(maxsize=None)
+def _google_auth() -> GoogleCalendarAuth:
+    return GoogleCalendarAuth()
+
+
+@functools.lru_cache(maxsize=None)
+def _google_calendar_service() -> GoogleCalendarService:
+    return GoogleCalendarService()
+
+
+# The auth URL response is fixed apart from the URL, which is spliced in
+_AUTH_URL_PREFIX = b'{"auth_url":'
+_AUTH_URL_SUFFIX = b',"instructions":' + orjson.dumps(
+    "Visit this URL to authorize calendar access, then return with the authorization code") + b"}"
+
+
 @router.get("/config/google/auth-url")
 async def get_google_auth_url():
     """Get Google OAuth2 authorization URL for setting up calendar access"""
     try:
-        from auth.google_auth import GoogleCalendarAuth
-        
-        auth_service = GoogleCalendarAuth()
-        auth_url = auth_service.get_authorization_url()
+        auth_url = _google_auth().get_authorization_url()
         
-        return {
-            "auth_url": auth_url,
-            "instructions": "Visit this URL to authorize calendar access, then return with the authorization code"
-        }
+        return Response(
+            content=_AUTH_URL_PREFIX + orjson.dumps(auth_url) + _AUTH_URL_SUFFIX,
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(
@@ -154,14 +276,11 @@ async def exchange_google_auth_code(
 ):
     """Exchange Google authorization code for access tokens"""
     try:
-        from auth.google_auth import GoogleCalendarAuth
-        
         auth_code = data.get("code")
         if not auth_code:
             raise ValueError("Authorization code is required")
             
-        auth_service = GoogleCalendarAuth()
-        credentials = await auth_service.exchange_code_for_tokens(auth_code)
+        credentials = await _google_auth().exchange_code_for_tokens(auth_code)
         
         return {
             "status": "success",
@@ -182,16 +301,39 @@ async def exchange_google_auth_code(
         )
 
 
+# Seconds a user's Google calendar list is reused while they pick one
+GOOGLE_CALENDARS_CACHE_TTL = 30.0
+
+# Recent Google calendar lists, by token digest -> (expiry, calendars)
+_google_calendars_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def _credentials_digest(*parts: Any) -> str:
+    """Cache key for a set of credentials that doesn't keep them in memory"""
+    return hashlib.sha256(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _prune_expired(cache: Dict[str, Any], now: float, expiry=lambda entry: entry) -> None:
+    """Drop cache entries whose expiry time has passed"""
+    for key in [key for key, entry in cache.items() if expiry(entry) <= now]:
+        del cache[key]
+
+
 @router.post("/config/google/calendars")
 async def list_google_calendars(
     token_info: Dict[str, Any] = Body(...)
 ):
     """List available Google calendars for the authenticated user"""
     try:
-        from services.google_calendar import GoogleCalendarService
-        
-        google_service = GoogleCalendarService()
-        calendars = await google_service.list_calendars(token_info)
+        key = _credentials_digest(token_info)
+        now = time.monotonic()
+        cached = _google_calendars_cache.get(key)
+        if cached is not None and now < cached[0]:
+            calendars = cached[1]
+        else:
+            calendars = await _google_calendar_service().list_calendars(token_info)
+            _prune_expired(_google_calendars_cache, now, expiry=lambda entry: entry[0])
+            _google_calendars_cache[key] = (now + GOOGLE_CALENDARS_CACHE_TTL, calendars)
         
         return {
             "calendars": calendars,
@@ -207,37 +349,62 @@ async def list_google_calendars(
 
 # CalDAV (Mailcow) Configuration Endpoints
 
+# Seconds a successful CalDAV connection test is trusted for the same
+# credentials, so a setup flow doesn't re-test on every step
+CALDAV_TEST_CACHE_TTL = 60.0
+
+# Expiry of recent successful connection tests, by credential digest
+_caldav_test_cache: Dict[str, float] = {}
+
+
+async def _test_caldav_credentials(server_url: str, username: str, password: str) -> bool:
+    """Test a CalDAV connection, reusing a recent successful test of the same credentials"""
+    key = _credentials_digest(server_url, username, password)
+    now = time.monotonic()
+    expires = _caldav_test_cache.get(key)
+    if expires is not None and now < expires:
+        return True
+
+    caldav_client = CalDAVClient(server_url, username, password)
+    is_connected = await caldav_client.test_connection()
+    if is_connected:
+        _prune_expired(_caldav_test_cache, now)
+        _caldav_test_cache[key] = now + CALDAV_TEST_CACHE_TTL
+    return is_connected
+
+
+_CALDAV_CONNECTED = orjson.dumps({
+    "status": "success",
+    "message": "CalDAV connection successful"
+})
+_CALDAV_NOT_CONNECTED = orjson.dumps({
+    "status": "error",
+    "message": "CalDAV connection failed"
+})
+
+
 @router.post("/config/caldav/test-connection")
 async def test_caldav_connection(
     connection_info: Dict[str, Any] = Body(...)
 ):
     """Test CalDAV connection to Mailcow server"""
     try:
-        from services.caldav_client import CalDAVClient
-        
         server_url = connection_info.get('server_url')
         username = connection_info.get('username') 
         password = connection_info.get('password')
         
-        if not all([server_url, username, password]):
+        if not (server_url and username and password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Missing required fields: server_url, username, password"
             )
         
-        caldav_client = CalDAVClient(server_url, username, password)
-        is_connected = caldav_client.test_connection()
+        is_connected = await _test_caldav_credentials(server_url, username, password)
         
-        if is_connected:
-            return {
-                "status": "success",
-                "message": "CalDAV connection successful"
-            }
-        else:
-            return {
-                "status": "error", 
-                "message": "CalDAV connection failed"
-            }
+        return Response(
+            content=_CALDAV_CONNECTED if is_connected else _CALDAV_NOT_CONNECTED,
+            media_type="application/json"
+        )
             
     except Exception as e:
         raise HTTPException(
@@ -252,20 +419,18 @@ async def list_caldav_calendars(
 ):
     """List available CalDAV calendars for the authenticated user"""
     try:
-        from services.caldav_client import CalDAVClient
-        
         server_url = connection_info.get('server_url')
         username = connection_info.get('username')
         password = connection_info.get('password')
         
-        if not all([server_url, username, password]):
+        if not (server_url and username and password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Missing required fields: server_url, username, password"
             )
         
         caldav_client = CalDAVClient(server_url, username, password)
-        calendars = caldav_client.discover_calendars()
+        calendars = await caldav_client.discover_calendars()
         
         return {
             "calendars": calendars,
@@ -292,17 +457,14 @@ async def configure_caldav_destination(
         calendar_url = destination_config.get('calendar_url')
         calendar_name = destination_config.get('calendar_name', 'Mailcow Calendar')
         
-        if not all([server_url, username, password, calendar_url]):
+        if not (server_url and username and password and calendar_url):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Missing required fields: server_url, username, password, calendar_url"
             )
         
         # Test the connection first
-        from services.caldav_client import CalDAVClient
-        caldav_client = CalDAVClient(server_url, username, password)
-        
-        if not caldav_client.test_connection():
+        if not await _test_caldav_credentials(server_url, username, password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="CalDAV connection test failed"
@@ -334,9 +496,10 @@ async def configure_caldav_destination(
         
         # Save configuration
         try:
-            config = await controller.load_configuration()
-            config.destination = destination
-            await controller.save_configuration(config)
+            async with controller.config_update_lock:
+                config = await controller.load_configuration()
+                config.destination = destination
+                await controller.save_configuration(config)
             logger.info(f"Saved CalDAV destination configuration")
         except Exception as e:
             logger.error(f"Error saving CalDAV configuration: {e}")
@@ -371,6 +534,8 @@ async def test_end_to_end_sync(
 ):
     """Test the complete sync flow from agent events to destination calendar"""
     try:
+        _flush_heartbeats()
+
         # Check if we have stored events from agents
         if not stored_events:
             return {
@@ -381,12 +546,12 @@ async def test_end_to_end_sync(
             }
         
         # Check if destination is configured
-        config = await controller.load_configuration()
+        config = await controller.read_configuration()
         if not config.destination:
             return {
                 "status": "no_destination",
                 "message": "No destination calendar configured. Configure Google Calendar destination first.",
-                "stored_events_count": sum(len(events) for events in stored_events.values())
+                "stored_events_count": stored_events.total_events
             }
         
         # Run the sync
@@ -406,20 +571,31 @@ async def test_end_to_end_sync(
         return {
             "status": "error",
             "message": f"End-to-end sync test failed: {str(e)}",
-            "stored_events_count": sum(len(events) for events in stored_events.values())
+            "stored_events_count": stored_events.total_events
         }
 
 # Source management endpoints
 
 
+# Serialised /sources body, tagged with the configuration object it was built
+# from, and its ETag
+_sources_cache: Optional[Tuple[SyncConfiguration, bytes, str]] = None
+
+
 @router.get("/sources")
 async def list_sources(
+    request: Request,
     controller: CalendarSyncController = Depends(get_sync_controller)
 ):
     """List all synchronization sources"""
+    global _sources_cache
+
     try:
-        config = await controller.load_configuration()
-        return [source.dict() for source in config.sources]
+        config = await controller.read_configuration()
+        if _sources_cache is None or _sources_cache[0] is not config:
+            body = orjson.dumps([s.dict() for s in config.sources])
+            _sources_cache = (config, body, _etag(body))
+        return _cacheable_json(request, _sources_cache[1], _sources_cache[2])
     except ValueError:
         # Return empty list if no configuration exists
         return []
@@ -515,6 +691,7 @@ async def add_agent(
 
 @router.get("/agents")
 async def list_agents(
+    request: Request,
     include_inactive: bool = Query(
         False, description="Include inactive agents"),
     max_inactive_days: int = Query(
@@ -531,29 +708,31 @@ async def list_agents(
         # Return agents from heartbeat status, not configuration
         # This shows actual running agents, not just configured ones
         agents_list = []
-        
+        cutoff = time.time() - max_inactive_days * 86400
+        _flush_heartbeats()
+
         for agent_id, agent_data in agent_status.items():
-            # Convert to dictionary and include additional computed fields
-            agent_dict = {
+            # Filter inactive agents if requested
+            if not include_inactive:
+                last_seen_epoch = agent_data.get("last_seen_epoch")
+                if last_seen_epoch and last_seen_epoch < cutoff:
+                    continue
+
+            last_seen = agent_data.get("last_seen")
+
+            # Datetimes are serialised by orjson, so they're passed through as-is
+            agents_list.append({
                 "id": agent_id,
                 "name": agent_data.get("name", f"Agent {agent_id}"),
                 "status": agent_data.get("status", "unknown"),
-                "last_seen": agent_data.get("last_seen").isoformat() if agent_data.get("last_seen") else None,
+                "last_seen": last_seen,
                 "environment": agent_data.get("environment", "Unknown"),
                 "event_count": agent_data.get("event_count", 0),
                 "uptime": None,  # Could be calculated if needed
-                "last_heartbeat": agent_data.get("last_seen").isoformat() if agent_data.get("last_seen") else None
-            }
-            
-            # Filter inactive agents if requested
-            if not include_inactive and agent_data.get("last_seen"):
-                cutoff = datetime.utcnow() - timedelta(days=max_inactive_days)
-                if agent_data["last_seen"] < cutoff:
-                    continue
-            
-            agents_list.append(agent_dict)
+                "last_heartbeat": last_seen
+            })
 
-        return agents_list
+        return _cacheable_json(request, orjson.dumps(agents_list))
     except Exception as e:
         logger.error(f"Failed to list agents: {str(e)}")
         raise HTTPException(
@@ -571,29 +750,30 @@ async def delete_agent(
 ):
     """Delete an agent by ID"""
     try:
-        config = await controller.load_configuration()
-        agents = getattr(config, 'agents', []) or []
-
-        # Find the agent
-        agent = next((a for a in agents if a.id == agent_id), None)
-        if not agent:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Agent {agent_id} not found"
-            )
-
-        # Check if agent is active (seen in last hour)
-        is_active = agent.last_seen and (
-            datetime.utcnow() - agent.last_seen) < timedelta(hours=1)
-        if is_active and not force:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Agent is currently active. Use force=true to delete an active agent."
-            )
-
-        # Remove the agent
-        config.agents = [a for a in agents if a.id != agent_id]
-        await controller.save_configuration(config)
+        async with controller.config_update_lock:
+            config = await controller.load_configuration()
+            agents = getattr(config, 'agents', []) or []
+
+            # Find the agent
+            agent = next((a for a in agents if a.id == agent_id), None)
+            if not agent:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Agent {agent_id} not found"
+                )
+
+            # Check if agent is active (seen in last hour)
+            is_active = agent.last_seen and (
+                datetime.utcnow() - agent.last_seen) < timedelta(hours=1)
+            if is_active and not force:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Agent is currently active. Use force=true to delete an active agent."
+                )
+
+            # Remove the agent
+            config.agents = [a for a in agents if a.id != agent_id]
+            await controller.save_configuration(config)
 
         return {"status": "success", "message": f"Agent {agent_id} deleted"}
 
@@ -622,30 +802,32 @@ async def cleanup_inactive_agents(
         dry_run: If True, only return the list of agents that would be deleted
     """
     try:
-        config = await controller.load_configuration()
-        agents = getattr(config, 'agents', []) or []
-
-        if not agents:
-            return {"status": "success", "message": "No agents to clean up", "deleted": []}
-
-        # Find inactive agents
-        cutoff = datetime.utcnow() - timedelta(days=max_inactive_days)
-        inactive_agents = [
-            agent for agent in agents
-            if agent.last_seen is None or agent.last_seen < cutoff
-        ]
-
-        if dry_run:
-            return {
-                "status": "dry_run",
-                "message": f"Would delete {len(inactive_agents)} inactive agents",
-                "agents": [agent.dict() for agent in inactive_agents]
-            }
+        async with controller.config_update_lock:
+            config = await controller.load_configuration()
+            agents = getattr(config, 'agents', []) or []
+
+            if not agents:
+                return {"status": "success", "message": "No agents to clean up", "deleted": []}
+
+            # Find inactive agents
+            cutoff = datetime.utcnow() - timedelta(days=max_inactive_days)
+            inactive_agents = [
+                agent for agent in agents
+                if agent.last_seen is None or agent.last_seen < cutoff
+            ]
+
+            if dry_run:
+                return {
+                    "status": "dry_run",
+                    "message": f"Would delete {len(inactive_agents)} inactive agents",
+                    "agents": [agent.dict() for agent in inactive_agents]
+                }
 
-        # Actually delete the agents
-        active_agents = [a for a in agents if a not in inactive_agents]
-        config.agents = active_agents
-        await controller.save_configuration(config)
+            # Actually delete the agents
+            inactive_ids = {agent.id for agent in inactive_agents}
+            active_agents = [a for a in agents if a.id not in inactive_ids]
+            config.agents = active_agents
+            await controller.save_configuration(config)
 
         return {
             "status": "success",
@@ -663,11 +845,12 @@ async def cleanup_inactive_agents(
 
 @router.get("/agents/status")
 async def check_agent_status(
+    request: Request,
     controller: CalendarSyncController = Depends(get_sync_controller)
 ):
     """Check status of all synchronization agents"""
     try:
-        return await controller.check_agent_heartbeats()
+        return _cacheable_json(request, orjson.dumps(await controller.check_agent_heartbeats()))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -678,11 +861,12 @@ async def check_agent_status(
 @router.get("/agents/{agent_id}/status")
 async def get_agent_status(
     agent_id: str,
+    request: Request,
     controller: CalendarSyncController = Depends(get_sync_controller)
 ):
     """Get status of a specific agent"""
     try:
-        config = await controller.load_configuration()
+        config = await controller.read_configuration()
         agents = getattr(config, 'agents', []) or []
         
         # Find the agent
@@ -693,7 +877,7 @@ async def get_agent_status(
                 detail=f"Agent {agent_id} not found"
             )
         
-        return agent.dict()
+        return _cacheable_json(request, orjson.dumps(agent.dict()))
     except HTTPException:
         raise
     except Exception as e:
@@ -718,7 +902,12 @@ async def register_agent(
                 detail="Agent ID is required"
             )
         
-        # Update agent_status dictionary for tracking
+        # Update agent_status dictionary for tracking. Heartbeats buffered
+        # before this registration are merged first so they can't overwrite it
+        _flush_heartbeats()
+        now = time.time()
+        previous = agent_status.get(agent_id)
+        _track_agent_status(previous.get("status") if previous else None, "active")
         agent_status[agent_id] = {
             "id": agent_id,
             "name": agent_data.get("name", f"Agent {agent_id}"),
@@ -728,7 +917,8 @@ async def register_agent(
             "capabilities": agent_data.get("capabilities", []),
             "config": agent_data.get("config", {}),
             "status": "active",
-            "last_seen": datetime.utcnow(),
+            "last_seen": datetime.utcfromtimestamp(now),
+            "last_seen_epoch": now,
             "event_count": 0
         }
         
@@ -746,50 +936,91 @@ async def register_agent(
         )
 
 
-@router.post("/agents/{agent_id}/heartbeat")
-async def agent_heartbeat(
-    agent_id: str,
-    data: Dict[str, Any] = Body(...),
-    controller: CalendarSyncController = Depends(get_sync_controller)
-):
-    """Register a heartbeat from a sync agent"""
-    print(f"Heartbeat received from agent {agent_id}: {data}")
+# Heartbeats arrive continuously from every agent, so the endpoint is a plain
+# ASGI app rather than a FastAPI route: it has no dependencies, its body is
+# parsed straight from the receive channel, and its success body is fixed.
+_HEARTBEAT_RESPONSE = orjson.dumps({
+    "status": "success",
+    "message": "Heartbeat registered",
+    "pending_updates": []  # Could add pending updates here
+})
+
+
+def _record_heartbeat(agent_id: str, data: Dict[str, Any]) -> None:
+    """Store the events in a heartbeat and buffer its status update"""
+    # Buffer the status update; agent_status picks it up on next read
+    heartbeat = {
+        "environment": data.get("environment", "Unknown"),
+        "status": data.get("status", "active"),
+        "last_seen_epoch": time.time()
+    }
+
+    # Process events if included
+    events = data.get("events", [])
+    if events:
+        stored_events[agent_id] = events
+        # May be fewer than reported if the store's per-agent cap applied
+        heartbeat["event_count"] = event_count = len(stored_events[agent_id])
+        logger.debug("Stored %d events from agent %s", event_count, agent_id)
+
+    pending = _pending_heartbeats.get(agent_id)
+    if pending is None:
+        _pending_heartbeats[agent_id] = heartbeat
+    else:
+        pending.update(heartbeat)
+
+
+async def _send_json(send, status_code: int, body: bytes) -> None:
+    """Send a complete JSON response on a raw ASGI connection"""
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class _AgentHeartbeatEndpoint:
+    """Register a heartbeat from a sync agent (ASGI app for the heartbeat route)"""
+
+    async def __call__(self, scope, receive, send):
+        agent_id = scope["path_params"]["agent_id"]
+        logger.debug("Heartbeat received from agent %s", agent_id)
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        try:
+            data = orjson.loads(b"".join(chunks))
+        except orjson.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            await _send_json(send, status.HTTP_422_UNPROCESSABLE_ENTITY,
+                             b'{"detail":"Request body must be a JSON object"}')
+            return
+
+        try:
+            _record_heartbeat(agent_id, data)
+        except Exception as e:
+            await _send_json(send, status.HTTP_400_BAD_REQUEST, orjson.dumps(
+                {"detail": f"Failed to register heartbeat: {str(e)}"}))
+            return
+
+        await _send_json(send, status.HTTP_200_OK, _HEARTBEAT_RESPONSE)
 
-    try:
-        # Update agent status
-        if agent_id not in agent_status:
-            # Auto-register agent if not found
-            agent_status[agent_id] = {
-                "id": agent_id,
-                "name": f"Agent {agent_id}",
-                "environment": data.get("environment", "Unknown"),
-                "status": "active",
-                "last_seen": datetime.utcnow(),
-                "event_count": 0
-            }
-        else:
-            agent_status[agent_id]["last_seen"] = datetime.utcnow()
-            agent_status[agent_id]["status"] = data.get("status", "active")
-        
-        # Process events if included
-        events = data.get("events", [])
-        if events:
-            stored_events[agent_id] = events
-            agent_status[agent_id]["event_count"] = len(events)
-            print(f"Stored {len(events)} events from agent {agent_id}")
-        
-        return {
-            "status": "success",
-            "message": "Heartbeat registered",
-            "pending_updates": []  # Could add pending updates here
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to register heartbeat: {str(e)}"
-        )
+
+# Starlette routes don't get the router prefix applied, so it's added here
+router.add_route(f"{router.prefix}/agents/{{agent_id}}/heartbeat",
+                 _AgentHeartbeatEndpoint(), methods=["POST"])
 
 # Synchronization endpoints
 
@@ -830,24 +1061,79 @@ async def sync_single_source(
 # Import endpoints
 
 
+class _RequestBodyReader:
+    """Async file-like view of a request body, so ijson can parse it as it arrives"""
+
+    def __init__(self, request: Request):
+        self._chunks = request.stream()
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        if not self._buffer and size != 0:
+            async for chunk in self._chunks:
+                if chunk:
+                    self._buffer = chunk
+                    break
+
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+async def _iter_import_events(request: Request) -> AsyncIterator[Dict[str, Any]]:
+    """Parse the JSON array of events in an import request body
+
+    Items that aren't event objects with an ID are skipped. With ijson the
+    events are yielded as the body arrives, without holding all of them.
+    """
+    if IJSON_AVAILABLE:
+        async for event in ijson.items(_RequestBodyReader(request), "item", use_float=True):
+            if isinstance(event, dict) and event.get("id"):
+                yield event
+        return
+
+    events = orjson.loads(await request.body())
+    if not isinstance(events, list):
+        raise ValueError("Expected a JSON array of events")
+    for event in events:
+        if isinstance(event, dict) and event.get("id"):
+            yield event
+
+
+async def _sync_imported_source(controller: CalendarSyncController, source_id: str):
+    """Sync a source after its import has been acknowledged"""
+    try:
+        await controller.sync_single_source(source_id)
+    except Exception as e:
+        logger.error(f"Sync after import failed for source {source_id}: {e}")
+
+
 @router.post("/import/{source_id}")
 async def import_events(
     source_id: str,
-    events: List[Dict[str, Any]] = Body(...),
+    request: Request,
+    background_tasks: BackgroundTasks,
     controller: CalendarSyncController = Depends(get_sync_controller)
 ):
-    """Import events for a specific source"""
+    """Import events for a specific source
+
+    The events are stored before responding; syncing them to the
+    destination runs after the response has been sent.
+    """
     try:
-        # Store the imported events
-        await controller.storage.save_import_data(source_id, events)
+        # Store the imported events as they're parsed
+        events_imported = await controller.storage.save_import_data_stream(
+            source_id, _iter_import_events(request))
 
         # Trigger a sync for this source
-        sync_result = await controller.sync_single_source(source_id)
+        background_tasks.add_task(_sync_imported_source, controller, source_id)
 
         return {
             "status": "success",
-            "events_imported": len(events),
-            "sync_result": sync_result
+            "events_imported": events_imported,
+            "sync_result": {"status": "scheduled", "source_id": source_id}
         }
     except Exception as e:
         raise HTTPException(
@@ -860,11 +1146,28 @@ async def import_events(
 
 @router.post("/push/calendar-metadata")
 async def push_calendar_metadata_changes(
-    changes: Dict[str, Any] = Body(...),
-    target_agents: Optional[List[str]] = Body(None),
+    request: Request,
     controller: CalendarSyncController = Depends(get_sync_controller)
 ):
-    """Push calendar metadata changes to remote agents"""
+    """Push calendar metadata changes to remote agents
+
+    The body is {"changes": {...}, "target_agents": [...]}, with
+    target_agents optional.
+    """
+    body = await _read_json_object(request)
+    changes = body.get("changes")
+    target_agents = body.get("target_agents")
+    if not isinstance(changes, dict):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="changes must be a JSON object"
+        )
+    if target_agents is not None and not isinstance(target_agents, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="target_agents must be a list of agent IDs"
+        )
+
     try:
         return await controller.push_calendar_metadata_changes(changes, target_agents)
     except Exception as e:
@@ -893,10 +1196,11 @@ async def push_sync_configuration_updates(
 @router.post("/agents/{agent_id}/receive-updates")
 async def send_updates_to_agent(
     agent_id: str,
-    updates: Dict[str, Any] = Body(...),
+    request: Request,
     controller: CalendarSyncController = Depends(get_sync_controller)
 ):
     """Send updates directly to a specific agent"""
+    updates = await _read_json_object(request)
     try:
         return await controller.send_updates_to_agent(agent_id, updates)
     except Exception as e:
@@ -938,49 +1242,111 @@ async def mark_update_processed(
 
 
 # In-memory storage for demonstration (replace with proper database)
-stored_events = {}
+stored_events = EventStore(max_events_per_agent=settings.MAX_STORED_EVENTS_PER_AGENT)
 agent_status = {}
 
+# Heartbeats received since agent_status was last brought up to date, by
+# agent ID. The heartbeat handler only records into this buffer, and readers
+# of agent_status merge it in first via _flush_heartbeats().
+_pending_heartbeats: Dict[str, Dict[str, Any]] = {}
+
+# Number of agent_status entries whose status is "active", kept up to date
+# wherever an entry's status is set so /stats doesn't scan every agent
+_active_agent_count = 0
+
+
+def _track_agent_status(old_status: Optional[str], new_status: Optional[str]) -> None:
+    """Adjust the active agent count for an agent changing status"""
+    global _active_agent_count
+    _active_agent_count += (new_status == "active") - (old_status == "active")
+
+
+def _flush_heartbeats() -> None:
+    """Merge buffered heartbeats into agent_status"""
+    if not _pending_heartbeats:
+        return
+
+    for agent_id, heartbeat in _pending_heartbeats.items():
+        last_seen_epoch = heartbeat["last_seen_epoch"]
+        last_seen = datetime.utcfromtimestamp(last_seen_epoch)
+        agent = agent_status.get(agent_id)
+        if agent is None:
+            # Auto-register agent if not found
+            _track_agent_status(None, "active")
+            agent_status[agent_id] = {
+                "id": agent_id,
+                "name": f"Agent {agent_id}",
+                "environment": heartbeat["environment"],
+                "status": "active",
+                "last_seen": last_seen,
+                "last_seen_epoch": last_seen_epoch,
+                "event_count": heartbeat.get("event_count", 0)
+            }
+        else:
+            _track_agent_status(agent.get("status"), heartbeat["status"])
+            agent["last_seen"] = last_seen
+            agent["last_seen_epoch"] = last_seen_epoch
+            agent["status"] = heartbeat["status"]
+            if "event_count" in heartbeat:
+                agent["event_count"] = heartbeat["event_count"]
+    _pending_heartbeats.clear()
+
+# Last (epoch second, ISO string) pair returned by _utc_now_iso
+_now_iso_cache: Tuple[int, str] = (0, "")
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO string, formatted at most once per second"""
+    global _now_iso_cache
+
+    second = int(time.time())
+    if _now_iso_cache[0] != second:
+        _now_iso_cache = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+    return _now_iso_cache[1]
+
 # Health check endpoint
 
 
 @router.get("/health")
 async def sync_health_check():
     """Check sync service health"""
-    return {
+    return ORJSONResponse({
         "status": "ok",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "timestamp": _utc_now_iso()
+    })
+
+
+# Encoded body of the unfiltered /events response, tagged with the event
+# store version it was built from, and its ETag
+_all_events_cache: Optional[Tuple[int, bytes, str]] = None
 
 
 @router.get("/events")
-async def get_all_events(agent_id: Optional[str] = None):
+async def get_all_events(request: Request, agent_id: Optional[str] = None):
     """Get all imported events, optionally filtered by agent"""
+    global _all_events_cache
+
     try:
         if agent_id:
             events = stored_events.get(agent_id, [])
-            return {
+            return ORJSONResponse({
                 "events": events,
                 "total_events": len(events),
                 "agent_id": agent_id
-            }
+            })
         else:
-            # Get all events from all agents
-            all_events = []
-            for aid, events in stored_events.items():
-                for event in events:
-                    event_copy = event.copy()
-                    event_copy["source_agent"] = aid
-                    all_events.append(event_copy)
-
-            # Sort by start time
-            all_events.sort(key=lambda x: x.get("start_time", ""))
-
-            return {
-                "events": all_events,
-                "total_events": len(all_events),
-                "agents": list(stored_events.keys())
-            }
+            # Get all events from all agents, merged by start time. The body
+            # is only re-encoded after an agent's events change.
+            version = stored_events.version
+            if _all_events_cache is None or _all_events_cache[0] != version:
+                all_events = stored_events.all_events()
+                body = orjson.dumps({
+                    "events": all_events,
+                    "total_events": len(all_events),
+                    "agents": list(stored_events.keys())
+                })
+                _all_events_cache = (version, body, _etag(body))
+            return _cacheable_json(request, _all_events_cache[1], _all_events_cache[2])
 
     except Exception as e:
         logger.error(f"Error retrieving events: {e}")
@@ -990,41 +1356,94 @@ async def get_all_events(agent_id: Optional[str] = None):
         )
 
 
+def _fullcalendar_json(agent_events: List[Tuple[str, List[AgentEvent]]]) -> bytes:
+    """Encode a JSON array of FullCalendar events"""
+    # The event dict literal below already compiles to a single constant-key
+    # map build, so the loop just keeps its lookups local
+    dumps = orjson.dumps
+    encoded = []
+    append = encoded.append
+
+    for agent_id, events in agent_events:
+        agent_name = _agent_name(agent_id)
+        color = get_agent_color(agent_id)
+
+        for event in events:
+            # Convert to FullCalendar format
+            append(dumps({
+                "id": event.id,
+                "title": event.title,
+                "start": event.start_time,
+                "end": event.end_time,
+                "allDay": event.all_day,
+                "backgroundColor": color,
+                "borderColor": color,
+                "extendedProps": {
+                    "description": event.description,
+                    "location": event.location,
+                    "provider": event.provider,
+                    "calendar_name": event.calendar_name,
+                    "agent_name": agent_name,
+                    "agent_id": agent_id,
+                    "status": event.status,
+                    "organizer": event.organizer,
+                    "participants": event.participants
+                }
+            }))
+
+    return b"[" + b",".join(encoded) + b"]"
+
+
+def _agent_name(agent_id: str) -> str:
+    """Display name of an agent"""
+    agent_info = agent_status.get(agent_id, {})
+    return agent_info.get("name", f"Agent {agent_id}")
+
+
+def _epoch_seconds(value: datetime) -> float:
+    """Seconds since the epoch for a datetime, taking naive values as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+# Encoded FullCalendar feed, tagged with the event store version, agent names
+# and date range it was built from, and its ETag. The feed only changes when
+# agents report new events or are renamed, so most requests reuse the last body.
+_fullcalendar_cache: Optional[Tuple[Tuple[Any, ...], bytes, str]] = None
+
+
 @router.get("/events/fullcalendar")
-async def get_events_fullcalendar_format():
+async def get_events_fullcalendar_format(
+    request: Request,
+    start: Optional[datetime] = Query(None, description="Only include events ending after this time"),
+    end: Optional[datetime] = Query(None, description="Only include events starting before this time")
+):
     """Get events in FullCalendar format for the frontend"""
-    try:
-        all_events = []
-
-        for agent_id, events in stored_events.items():
-            agent_info = agent_status.get(agent_id, {})
-            agent_name = agent_info.get("name", f"Agent {agent_id}")
-
-            for event in events:
-                # Convert to FullCalendar format
-                fc_event = {
-                    "id": event.get("id"),
-                    "title": event.get("title", "Untitled Event"),
-                    "start": event.get("start_time"),
-                    "end": event.get("end_time"),
-                    "allDay": event.get("all_day", False),
-                    "backgroundColor": get_agent_color(agent_id),
-                    "borderColor": get_agent_color(agent_id),
-                    "extendedProps": {
-                        "description": event.get("description", ""),
-                        "location": event.get("location", ""),
-                        "provider": event.get("provider", "unknown"),
-                        "calendar_name": event.get("calendar_name", ""),
-                        "agent_name": agent_name,
-                        "agent_id": agent_id,
-                        "status": event.get("status", "confirmed"),
-                        "organizer": event.get("organizer", {}),
-                        "participants": event.get("participants", [])
-                    }
-                }
-                all_events.append(fc_event)
+    global _fullcalendar_cache
 
-        return all_events
+    try:
+        _flush_heartbeats()
+        window = None
+        if start is not None or end is not None:
+            window = (
+                _epoch_seconds(start) if start is not None else float("-inf"),
+                _epoch_seconds(end) if end is not None else float("inf")
+            )
+        agent_names = tuple(_agent_name(agent_id) for agent_id in stored_events)
+
+        key = (stored_events.version, agent_names, window)
+        cached = _fullcalendar_cache
+        if cached is None or cached[0] != key:
+            if window is None:
+                agent_events = stored_events.agent_events()
+            else:
+                # FullCalendar asks for the visible date range, so only the
+                # events overlapping it need to be found and encoded
+                agent_events = stored_events.agent_events_between(*window)
+            body = _fullcalendar_json(agent_events)
+            cached = _fullcalendar_cache = (key, body, _etag(body))
+        return _cacheable_json(request, cached[1], cached[2])
 
     except Exception as e:
         logger.error(f"Error formatting events for FullCalendar: {e}")
@@ -1034,33 +1453,35 @@ async def get_events_fullcalendar_format():
         )
 
 
+AGENT_COLORS = (
+    "#3788d8",  # Blue
+    "#e74c3c",  # Red
+    "#2ecc71",  # Green
+    "#f39c12",  # Orange
+    "#9b59b6",  # Purple
+    "#1abc9c",  # Teal
+    "#e67e22",  # Carrot
+    "#34495e"   # Dark Blue Grey
+)
+
+
+@functools.lru_cache(maxsize=256)
 def get_agent_color(agent_id: str) -> str:
     """Get a consistent color for an agent"""
-    colors = [
-        "#3788d8",  # Blue
-        "#e74c3c",  # Red
-        "#2ecc71",  # Green
-        "#f39c12",  # Orange
-        "#9b59b6",  # Purple
-        "#1abc9c",  # Teal
-        "#e67e22",  # Carrot
-        "#34495e"   # Dark Blue Grey
-    ]
-
-    # Use hash of agent_id to consistently assign colors
-    hash_val = hash(agent_id) % len(colors)
-    return colors[hash_val]
+    # crc32 is stable across processes, unlike the randomly seeded str hash()
+    return AGENT_COLORS[zlib.crc32(agent_id.encode()) % len(AGENT_COLORS)]
 
 
 @router.delete("/events/{agent_id}")
 async def clear_agent_events(agent_id: str):
     """Clear all events for a specific agent"""
     try:
-        if agent_id in stored_events:
-            event_count = len(stored_events[agent_id])
-            del stored_events[agent_id]
+        events = stored_events.pop(agent_id, None)
+        if events is not None:
+            event_count = len(events)
 
             # Update agent status
+            _flush_heartbeats()
             if agent_id in agent_status:
                 agent_status[agent_id]["event_count"] = 0
 
@@ -1082,29 +1503,32 @@ async def clear_agent_events(agent_id: str):
         )
 
 
+# Encoded /stats body and its ETag, tagged with the inputs it was built from.
+# last_updated has one-second resolution, so at most one body is built per
+# second while nothing else changes.
+_stats_cache: Optional[Tuple[Tuple[Any, ...], bytes, str]] = None
+
+
 @router.get("/stats")
-async def get_sync_stats():
+async def get_sync_stats(request: Request):
     """Get synchronization statistics"""
-    try:
-        total_events = sum(len(events) for events in stored_events.values())
-        active_agents = len(
-            [a for a in agent_status.values() if a.get("status") == "active"])
-
-        # Calculate events by provider
-        provider_stats = {}
-        for events in stored_events.values():
-            for event in events:
-                provider = event.get("provider", "unknown")
-                provider_stats[provider] = provider_stats.get(provider, 0) + 1
+    global _stats_cache
 
-        return {
-            "total_events": total_events,
-            "total_agents": len(agent_status),
-            "active_agents": active_agents,
-            "events_by_agent": {aid: len(events) for aid, events in stored_events.items()},
-            "events_by_provider": provider_stats,
-            "last_updated": datetime.utcnow().isoformat()
-        }
+    try:
+        _flush_heartbeats()
+
+        key = (stored_events.version, len(agent_status), _active_agent_count, _utc_now_iso())
+        if _stats_cache is None or _stats_cache[0] != key:
+            body = orjson.dumps({
+                "total_events": stored_events.total_events,
+                "total_agents": len(agent_status),
+                "active_agents": _active_agent_count,
+                "events_by_agent": stored_events.event_counts(),
+                "events_by_provider": stored_events.provider_counts(),
+                "last_updated": key[3]
+            })
+            _stats_cache = (key, body, _etag(body))
+        return _cacheable_json(request, _stats_cache[1], _stats_cache[2])
 
     except Exception as e:
         logger.error(f"Error getting sync stats: {e}")
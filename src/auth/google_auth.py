@@ -1,5 +1,6 @@
 import os
-from typing import Dict, Optional, List, Any
+from collections import OrderedDict
+from typing import Dict, Optional, List, Any, Tuple
 import json
 from fastapi import HTTPException, status
 from google.oauth2.credentials import Credentials
@@ -15,6 +16,9 @@ SCOPES = [
     'https://www.googleapis.com/auth/calendar.events'
 ]
 
+# Number of Calendar API service objects kept for reuse, keyed by OAuth tokens
+CALENDAR_SERVICE_CACHE_SIZE = 32
+
 # Dummy calendar service for when credentials aren't available
 
 
@@ -33,6 +37,9 @@ class DummyCalendarService:
     def calendarList(self):
         return DummyCalendarListResource()
 
+    def new_batch_http_request(self, callback=None):
+        return DummyBatchRequest(callback)
+
 
 class DummyEventsResource:
     def list(self, **kwargs):
@@ -66,6 +73,22 @@ class DummyRequest:
         return self.result_data
 
 
+class DummyBatchRequest:
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        if request_id is None:
+            request_id = str(len(self.requests))
+        self.requests.append((request_id, request, callback or self.callback))
+
+    def execute(self):
+        for request_id, request, callback in self.requests:
+            if callback is not None:
+                callback(request_id, request.execute(), None)
+
+
 class GoogleCalendarAuth:
     def __init__(self):
         """Initialize Google Calendar authentication"""
@@ -73,6 +96,11 @@ class GoogleCalendarAuth:
         self.client_secret = settings.GOOGLE_CLIENT_SECRET
         self.redirect_uri = settings.GOOGLE_REDIRECT_URI
 
+        # Calendar API services by (access token, refresh token), least
+        # recently used first. Building a service parses the whole discovery
+        # document, so repeat calls with the same tokens reuse the last one.
+        self._calendar_services: "OrderedDict[Tuple[Optional[str], Optional[str]], Any]" = OrderedDict()
+
         # Instead of raising an error, just set a flag indicating we're in dummy mode
         self.dummy_mode = not all([self.client_id, self.client_secret])
         if self.dummy_mode:
@@ -80,19 +108,8 @@ class GoogleCalendarAuth:
         else:
             print("Google Calendar authentication initialized successfully")
 
-    def create_auth_url(self, tenant_id: Optional[str] = None, redirect_uri: Optional[str] = None) -> Dict[str, str]:
-        """
-        Create authentication URL for Google OAuth flow
-        Optionally specify a tenant_id for multi-tenant applications
-        Optionally specify a custom redirect_uri for different environments
-        """
-        if self.dummy_mode:
-            return {"auth_url": "https://dummy-auth-url.example.com", "state": "dummy-state"}
-
-        # Use provided redirect_uri or fall back to configured default
-        actual_redirect_uri = redirect_uri or self.redirect_uri
-
-        # Create OAuth flow instance
+    def _create_flow(self, redirect_uri: str) -> Flow:
+        """Create an OAuth flow for the given redirect URI"""
         flow = Flow.from_client_config(
             {
                 "web": {
@@ -101,14 +118,30 @@ class GoogleCalendarAuth:
                     "auth_uri": "https://accounts.google.com/o/oauth2/auth",
                     "token_uri": "https://oauth2.googleapis.com/token",
                     # Use dynamic redirect URI
-                    "redirect_uris": [actual_redirect_uri]
+                    "redirect_uris": [redirect_uri]
                 }
             },
             scopes=SCOPES
         )
 
         # Set redirect URI to the actual one we want to use
-        flow.redirect_uri = actual_redirect_uri
+        flow.redirect_uri = redirect_uri
+        return flow
+
+    def create_auth_url(self, tenant_id: Optional[str] = None, redirect_uri: Optional[str] = None) -> Dict[str, str]:
+        """
+        Create authentication URL for Google OAuth flow
+        Optionally specify a tenant_id for multi-tenant applications
+        Optionally specify a custom redirect_uri for different environments
+        """
+        if self.dummy_mode:
+            return {"auth_url": "https://dummy-auth-url.example.com", "state": "dummy-state"}
+
+        # Use provided redirect_uri or fall back to configured default
+        actual_redirect_uri = redirect_uri or self.redirect_uri
+
+        # Create OAuth flow instance
+        flow = self._create_flow(actual_redirect_uri)
 
         # Generate authorization URL
         state = tenant_id if tenant_id else ""
@@ -135,22 +168,8 @@ class GoogleCalendarAuth:
             # Use provided redirect_uri or fall back to configured default
             actual_redirect_uri = redirect_uri or self.redirect_uri
 
-            flow = Flow.from_client_config(
-                {
-                    "web": {
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                        # Use dynamic redirect URI
-                        "redirect_uris": [actual_redirect_uri]
-                    }
-                },
-                scopes=SCOPES
-            )
-
             # IMPORTANT: Use the same redirect_uri that was used for auth URL creation
-            flow.redirect_uri = actual_redirect_uri
+            flow = self._create_flow(actual_redirect_uri)
 
             # Exchange authorization code for tokens
             flow.fetch_token(code=code)
@@ -200,9 +219,21 @@ class GoogleCalendarAuth:
             # Return a dummy service for testing
             return DummyCalendarService()
 
+        key = (token_info.get("access_token"), token_info.get("refresh_token"))
+        service = self._calendar_services.get(key)
+        if service is not None:
+            self._calendar_services.move_to_end(key)
+            return service
+
         try:
             credentials = self.get_credentials(token_info)
-            service = build('calendar', 'v3', credentials=credentials)
+            # The discovery document ships with the client library, so
+            # there is no discovery cache to consult
+            service = build('calendar', 'v3', credentials=credentials,
+                            cache_discovery=False)
+            self._calendar_services[key] = service
+            if len(self._calendar_services) > CALENDAR_SERVICE_CACHE_SIZE:
+                self._calendar_services.popitem(last=False)
             return service
         except Exception as e:
             raise HTTPException(
@@ -4,9 +4,46 @@ Microsoft Graph Client Adapter
 This module provides a compatibility layer for different versions of the Microsoft Graph SDK.
 """
 
-from typing import Dict, Any, Optional
-
-import requests
+from typing import Dict, Any, List, Optional
+
+import httpx
+import orjson
+
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+GRAPH_TIMEOUT = 30.0
+GRAPH_MAX_CONNECTIONS = 100
+GRAPH_MAX_KEEPALIVE_CONNECTIONS = 50
+# Maximum number of requests Graph accepts in one JSON batch
+GRAPH_BATCH_SIZE = 20
+
+# HTTP client shared by every GraphClient, so connections to Graph are reused
+# across requests instead of being opened (and TLS-negotiated) per call
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared Microsoft Graph HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=GRAPH_BASE_URL,
+            timeout=GRAPH_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=GRAPH_MAX_CONNECTIONS,
+                max_keepalive_connections=GRAPH_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            # Negotiated via ALPN, falling back to HTTP/1.1 where unsupported
+            http2=True
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared Microsoft Graph HTTP client and its pooled connections"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class GraphClient:
@@ -14,15 +51,23 @@ class GraphClient:
     A simple GraphClient implementation that works without relying on msgraph-core structure
     """
 
-    def __init__(self, credentials: str):
+    def __init__(self, credentials: str, http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the GraphClient with an access token.
 
         Args:
             credentials: Access token to authenticate with Microsoft Graph API
+            http_client: HTTP client to send requests with (defaults to the shared one)
         """
         self.access_token = credentials
-        self.base_url = "https://graph.microsoft.com/v1.0"
+        self.base_url = GRAPH_BASE_URL
+        self.http_client = http_client or get_http_client()
+        self.headers = {"Authorization": f"Bearer {credentials}"}
+        self.json_headers = {**self.headers, "Content-Type": "application/json"}
+
+    def _encode(self, json_data: Optional[Dict[str, Any]]) -> Optional[bytes]:
+        """Encode a request body with orjson, leaving an absent body empty"""
+        return None if json_data is None else orjson.dumps(json_data)
 
     async def get(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -35,15 +80,10 @@ class GraphClient:
         Returns:
             The JSON response from the API
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
-        response = requests.get(url, headers=headers, params=params)
+        response = await self.http_client.get(
+            endpoint, headers=self.headers, params=params)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     async def post(self, endpoint: str, json_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -56,15 +96,10 @@ class GraphClient:
         Returns:
             The JSON response from the API
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
-        response = requests.post(url, headers=headers, json=json_data)
+        response = await self.http_client.post(
+            endpoint, headers=self.json_headers, content=self._encode(json_data))
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     async def patch(self, endpoint: str, json_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -77,15 +112,10 @@ class GraphClient:
         Returns:
             The JSON response from the API
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
-        response = requests.patch(url, headers=headers, json=json_data)
+        response = await self.http_client.patch(
+            endpoint, headers=self.json_headers, content=self._encode(json_data))
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     async def delete(self, endpoint: str) -> None:
         """
@@ -94,10 +124,43 @@ class GraphClient:
         Args:
             endpoint: The API endpoint (e.g., "/me/events/{id}")
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}"
-        }
-
-        response = requests.delete(url, headers=headers)
+        response = await self.http_client.delete(endpoint, headers=self.headers)
         response.raise_for_status()
+
+    async def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send several requests to the Microsoft Graph API through JSON batching.
+
+        Requests are sent GRAPH_BATCH_SIZE at a time, each group as one
+        POST to /$batch.
+
+        Args:
+            requests: Requests with "method", "url" (e.g., "/me/events") and
+                an optional JSON "body"
+
+        Returns:
+            Graph's response for each request ("status", "headers", "body"),
+            in the same order as requests
+        """
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+
+        for start in range(0, len(requests), GRAPH_BATCH_SIZE):
+            batch_requests = []
+            for index in range(start, min(start + GRAPH_BATCH_SIZE, len(requests))):
+                request = requests[index]
+                batch_request = {
+                    "id": str(index),
+                    "method": request["method"],
+                    "url": request["url"]
+                }
+                if request.get("body") is not None:
+                    batch_request["body"] = request["body"]
+                    batch_request["headers"] = {"Content-Type": "application/json"}
+                batch_requests.append(batch_request)
+
+            result = await self.post("/$batch", {"requests": batch_requests})
+            # Graph may answer the requests in a batch in any order
+            for response in result.get("responses", []):
+                responses[int(response["id"])] = response
+
+        return responses
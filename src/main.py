@@ -21,7 +21,9 @@
 import asyncio
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
 # Apply aioredis patch first, before any other imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -32,10 +34,20 @@ try:
 except ImportError:
     logging.warning("Could not import aioredis patch, continuing anyway")
 
+import orjson
 import uvicorn
+from typing import Any
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+# Brotli compression for clients that accept it, if available
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 # Add current directory and src directory to path
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -185,12 +197,26 @@ except ImportError:
     except Exception as e:
         print(f"Error importing settings: {e}")
 
+
+class AppJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that always accepts non-str dict keys, turning int, None
+    and other keys into strings as the stdlib json encoder does, instead
+    of raising TypeError
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 # Remove duplicate load_dotenv call (already called above)
 # Initialize FastAPI app
 app = FastAPI(
     title="Calendar Integration Microservice",
     description="Microservice for integrating multiple calendar providers",
-    version="1.0.0"
+    version="1.0.0",
+    # Serialise every route's response with orjson, not just the sync router's
+    default_response_class=AppJSONResponse
 )
 
 # Exception handler for application errors
@@ -199,20 +225,19 @@ app = FastAPI(
 @app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
     print(f"Global exception handler caught: {exc}")
-    return JSONResponse(
+    return AppJSONResponse(
         status_code=500,
         content={"message": f"Internal server error: {str(exc)}"},
     )
 
-# Include API routers
-if api_router:
-    app.include_router(api_router, prefix="/api")
-    print("API router included")
-
-if sync_router:
-    # No prefix needed as the router already has prefix='/sync'
-    app.include_router(sync_router)
-    print("Sync router included")
+# Compress larger responses (event lists, FullCalendar feed, stats).
+# Level 4 keeps most of the size win at a fraction of level 9's CPU cost.
+# Brotli is preferred when installed; it still gzips for clients that
+# don't accept br.
+if BROTLI_AVAILABLE:
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
 
 # Configure CORS with hardcoded wildcard origins
 # Hardcode CORS to allow all origins (*) for development
@@ -255,6 +280,27 @@ sync_controller = None
 # Background task for periodic sync
 sync_task = None
 
+# Thread that writes root log records queued by request handlers
+log_listener = None
+
+
+def queue_root_log_handlers():
+    """Move the root logger's handlers behind a queue so log output is
+    written from a background thread rather than the event loop"""
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    if not handlers:
+        return None
+
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
 
 async def periodic_sync(interval_minutes: int = 60):
     """Run periodic synchronization"""
@@ -289,7 +335,9 @@ async def periodic_sync(interval_minutes: int = 60):
 
 @app.on_event("startup")
 async def startup_event():
-    global calendar_mcp_server, sync_storage, sync_controller, sync_task
+    global calendar_mcp_server, sync_storage, sync_controller, sync_task, log_listener
+
+    log_listener = queue_root_log_handlers()
 
     # Initialize the Calendar MCP server if agents module is available
     if agents_available:
@@ -312,11 +360,14 @@ async def startup_event():
     if SyncStorageManager is not None:
         sync_storage = SyncStorageManager()
         await sync_storage.initialize()
+        app.state.sync_storage = sync_storage
         print("Sync storage initialized")
 
         # Initialize sync controller
         if CalendarSyncController is not None:
             sync_controller = CalendarSyncController(sync_storage)
+            # Shared by every sync router request via get_sync_controller
+            app.state.sync_controller = sync_controller
             print("Sync controller initialized")
 
             # Start periodic sync task
@@ -333,7 +384,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     # Cleanup resources
-    global calendar_mcp_server, sync_storage, sync_task
+    global calendar_mcp_server, sync_storage, sync_task, log_listener
 
     # Stop MCP server if it was initialized
     if calendar_mcp_server:
@@ -362,6 +413,20 @@ async def shutdown_event():
         except Exception as e:
             print(f"Error closing sync storage: {e}")
 
+    # Close the pooled outbound HTTP connections to Graph and CalDAV servers
+    try:
+        from auth.graph_adapter import close_http_client as close_graph_client
+        from services.caldav_client import close_http_client as close_caldav_client
+        await close_graph_client()
+        await close_caldav_client()
+    except Exception as e:
+        print(f"Error closing HTTP clients: {e}")
+
+    # Flush queued log records and stop the writer thread
+    if log_listener:
+        log_listener.stop()
+        log_listener = None
+
 # Health check endpoint
 
 
@@ -387,4 +452,6 @@ async def list_routes():
 
 # Direct execution for development
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8008, reload=True)
+    uvicorn.run("main:app", host="0.0.0.0", port=8008,
+                loop="uvloop", http="httptools",
+                reload=os.environ.get("DEV") == "1")
@@ -4,8 +4,10 @@ CalDAV Client for Mailcow Integration
 This module provides CalDAV functionality to sync with Mailcow calendar servers.
 """
 
-import requests
-from typing import List, Dict, Any
+import asyncio
+import sys
+import httpx
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 import uuid
 from urllib.parse import urljoin
@@ -15,11 +17,178 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+CALDAV_TIMEOUT = 30.0
+CALDAV_MAX_CONNECTIONS = 100
+CALDAV_MAX_KEEPALIVE_CONNECTIONS = 50
+# Number of event PUTs create_events keeps in flight at once
+CALDAV_WRITE_CONCURRENCY = 8
+
+# CalDAV PROPFIND body used to discover calendars, encoded once
+_PROPFIND_BODY = b'''<?xml version="1.0" encoding="utf-8" ?>
+<D:propfind xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
+    <D:prop>
+        <D:displayname />
+        <C:calendar-description />
+        <D:resourcetype />
+    </D:prop>
+</D:propfind>'''
+
+_PROPFIND_HEADERS = {
+    'Depth': '1',
+    'Content-Type': 'application/xml; charset=utf-8'
+}
+
+# Element paths read from each PROPFIND multi-status response
+_RESPONSE_TAG = '{DAV:}response'
+_HREF_PATH = './/{DAV:}href'
+_DISPLAYNAME_PATH = './/{DAV:}displayname'
+_RESOURCETYPE_PATH = './/{DAV:}resourcetype'
+_CALENDAR_PATH = './/{urn:ietf:params:xml:ns:caldav}calendar'
+
+# Build event iCalendar bodies from a template rather than through the
+# icalendar component model. Set to False to fall back to icalendar.
+USE_ICS_TEMPLATE = True
+
+_ICS_PRODID = '-//Chroniton Capacitor//Calendar Sync//EN'
+_ICS_HEADERS = {'Content-Type': 'text/calendar; charset=utf-8'}
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing "Z" from Python 3.11 on
+    _parse_datetime = datetime.fromisoformat
+else:
+    def _parse_datetime(value: str) -> datetime:
+        """Parse an ISO 8601 datetime, including a trailing "Z" for UTC"""
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _ical_escape(value: Any) -> str:
+    """Escape a value for use in an iCalendar TEXT property"""
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _ical_datetime(value: datetime) -> str:
+    """Format a datetime as an iCalendar DATE-TIME, in UTC if it has a timezone"""
+    if value.tzinfo is None:
+        return value.strftime('%Y%m%dT%H%M%S')
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ical_fold(line: str) -> str:
+    """Fold a content line at 75 characters, as icalendar does"""
+    if len(line) <= 75:
+        return line
+    parts = [line[:75]]
+    parts.extend(line[i:i + 74] for i in range(75, len(line), 74))
+    return '\r\n '.join(parts)
+
+
+def _build_event_ics(uid: str, event_data: Dict[str, Any], now: datetime,
+                     created: Any = None) -> bytes:
+    """
+    Build the iCalendar body for an event
+
+    Args:
+        uid: Event UID
+        event_data: Event data dictionary
+        now: Time to stamp the event with
+        created: Existing CREATED property to preserve, if any
+
+    Returns:
+        Encoded VCALENDAR containing the event
+    """
+    start = _parse_datetime(event_data['start_time'])
+    end = _parse_datetime(event_data['end_time'])
+
+    if not USE_ICS_TEMPLATE:
+        cal = Calendar()
+        cal.add('prodid', _ICS_PRODID)
+        cal.add('version', '2.0')
+
+        event = Event()
+        event.add('uid', uid)
+        event.add('dtstart', start)
+        event.add('dtend', end)
+        event.add('summary', vText(event_data.get('title', 'No Title')))
+        event.add('description', vText(event_data.get('description', '')))
+
+        if event_data.get('location'):
+            event.add('location', vText(event_data['location']))
+
+        event.add('dtstamp', now)
+        event.add('created', created if created is not None else now)
+        event.add('last-modified', now)
+
+        cal.add_component(event)
+        return cal.to_ical()
+
+    now_ical = _ical_datetime(now)
+    created_ical = created.to_ical().decode() if created is not None else now_ical
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{_ICS_PRODID}',
+        'BEGIN:VEVENT',
+        f'SUMMARY:{_ical_escape(event_data.get("title", "No Title"))}',
+        f'DTSTART:{_ical_datetime(start)}',
+        f'DTEND:{_ical_datetime(end)}',
+        f'DTSTAMP:{now_ical}',
+        f'UID:{_ical_escape(uid)}',
+        f'CREATED:{created_ical}',
+        f'DESCRIPTION:{_ical_escape(event_data.get("description", ""))}',
+        f'LAST-MODIFIED:{now_ical}'
+    ]
+    if event_data.get('location'):
+        lines.append(f'LOCATION:{_ical_escape(event_data["location"])}')
+    lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+
+    return ('\r\n'.join(_ical_fold(line) for line in lines) + '\r\n').encode('utf-8')
+
+
+# HTTP client shared by every CalDAVClient. A CalDAVClient is created per API
+# request, so sharing one connection pool lets connections to the same server
+# (and their TLS sessions) be reused across requests. Credentials are sent
+# per request by each CalDAVClient.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared CalDAV HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            headers={'User-Agent': 'Chroniton-Capacitor/1.0'},
+            # Disable SSL verification for self-signed certificates
+            # This is common with self-hosted Mailcow instances
+            verify=False,
+            follow_redirects=True,
+            timeout=CALDAV_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=CALDAV_MAX_CONNECTIONS,
+                max_keepalive_connections=CALDAV_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            # Negotiated via ALPN, falling back to HTTP/1.1 where unsupported
+            http2=True
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared CalDAV HTTP client and its pooled connections"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class CalDAVClient:
     """CalDAV client for syncing with Mailcow calendar servers"""
 
-    def __init__(self, server_url: str, username: str, password: str):
+    def __init__(self, server_url: str, username: str, password: str,
+                 http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize CalDAV client
 
@@ -27,26 +196,15 @@ class CalDAVClient:
             server_url: CalDAV server URL (e.g., https://mail.yourdomain.com/SOGo/dav/)
             username: Mailcow username
             password: Mailcow password
+            http_client: HTTP client to send requests with (defaults to the shared one)
         """
         self.server_url = server_url.rstrip('/')
         self.username = username
         self.password = password
-        self.session = requests.Session()
-        self.session.auth = (username, password)
-        self.session.headers.update({
-            'User-Agent': 'Chroniton-Capacitor/1.0',
-            'Content-Type': 'application/xml; charset=utf-8'
-        })
-        
-        # Disable SSL verification for self-signed certificates
-        # This is common with self-hosted Mailcow instances
-        self.session.verify = False
-        
-        # Suppress SSL warnings when verification is disabled
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-    def discover_calendars(self) -> List[Dict[str, str]]:
+        self.http_client = http_client or get_http_client()
+        self.auth = httpx.BasicAuth(username, password)
+
+    async def discover_calendars(self) -> List[Dict[str, str]]:
         """
         Discover available calendars for the user
 
@@ -54,16 +212,6 @@ class CalDAVClient:
             List of calendar dictionaries with name, url, and description
         """
         try:
-            # CalDAV PROPFIND to discover calendars
-            propfind_body = '''<?xml version="1.0" encoding="utf-8" ?>
-            <D:propfind xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
-                <D:prop>
-                    <D:displayname />
-                    <C:calendar-description />
-                    <D:resourcetype />
-                </D:prop>
-            </D:propfind>'''
-
             # Try common CalDAV paths (including Mailcow/SOGo specific paths)
             potential_paths = [
                 # Mailcow/SOGo with email as username
@@ -77,61 +225,104 @@ class CalDAVClient:
                 '/dav/'
             ]
 
-            calendars = []
-
-            for path in potential_paths:
-                url = urljoin(self.server_url, path)
-                logger.info(f"Trying CalDAV discovery at: {url}")
-                try:
-                    response = self.session.request(
-                        'PROPFIND',
-                        url,
-                        data=propfind_body,
-                        headers={'Depth': '1'}
-                    )
-
-                    logger.info(
-                        f"PROPFIND response for {url}: {response.status_code}")
-
-                    if response.status_code == 207:  # Multi-Status
-                        # Parse WebDAV XML response
-                        root = ET.fromstring(response.text)
-
-                        for response_elem in root.findall('.//{DAV:}response'):
-                            href_elem = response_elem.find('.//{DAV:}href')
-                            displayname_elem = response_elem.find(
-                                './/{DAV:}displayname')
-                            resourcetype_elem = response_elem.find(
-                                './/{DAV:}resourcetype')
-
-                            # Check if this is a calendar resource
-                            if (resourcetype_elem is not None and
-                                    resourcetype_elem.find('.//{urn:ietf:params:xml:ns:caldav}calendar') is not None):
-
-                                calendar_name = displayname_elem.text if displayname_elem is not None else 'Unnamed Calendar'
-                                calendar_url = href_elem.text if href_elem is not None else ''
-
-                                calendars.append({
-                                    'name': calendar_name,
-                                    'url': urljoin(self.server_url, calendar_url),
-                                    'description': f'CalDAV calendar: {calendar_name}'
-                                })
-
-                        if calendars:
-                            break  # Found calendars, stop trying other paths
-
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to discover calendars at {url}: {e}")
-                    continue
+            # Probe every path at once, but still prefer them in the order
+            # above: take the first path (in that order) that has calendars,
+            # and cancel the probes that are no longer needed
+            probes = [
+                asyncio.ensure_future(self._probe_calendars(
+                    urljoin(self.server_url, path)))
+                for path in potential_paths
+            ]
+
+            try:
+                for probe in probes:
+                    calendars = await probe
+                    if calendars:
+                        return calendars  # Found calendars, stop trying other paths
+            finally:
+                for probe in probes:
+                    probe.cancel()
 
-            return calendars
+            return []
 
         except Exception as e:
             logger.error(f"CalDAV calendar discovery failed: {e}")
             return []
 
-    def create_event(self, calendar_url: str, event_data: Dict[str, Any]) -> bool:
+    async def _probe_calendars(self, url: str) -> List[Dict[str, str]]:
+        """
+        List the calendars found at a single discovery URL
+
+        Args:
+            url: URL to send the PROPFIND request to
+
+        Returns:
+            List of calendar dictionaries, empty if none were found or the request failed
+        """
+        logger.info(f"Trying CalDAV discovery at: {url}")
+        calendars = []
+        try:
+            async with self.http_client.stream(
+                'PROPFIND',
+                url,
+                content=_PROPFIND_BODY,
+                headers=_PROPFIND_HEADERS,
+                auth=self.auth
+            ) as response:
+                logger.info(
+                    f"PROPFIND response for {url}: {response.status_code}")
+
+                if response.status_code == 207:  # Multi-Status
+                    # Parse the WebDAV XML response as it arrives, handling
+                    # each <response> element once it is complete
+                    parser = ET.XMLPullParser(events=('end',))
+                    async for chunk in response.aiter_bytes():
+                        parser.feed(chunk)
+                        self._collect_calendars(parser.read_events(), calendars)
+                    parser.close()
+                    self._collect_calendars(parser.read_events(), calendars)
+
+        except Exception as e:
+            logger.warning(
+                f"Failed to discover calendars at {url}: {e}")
+            return []
+
+        return calendars
+
+    def _collect_calendars(self, events, calendars: List[Dict[str, str]]) -> None:
+        """
+        Add the calendar resources among parsed PROPFIND elements to a list
+
+        Args:
+            events: (event, element) pairs read from an XMLPullParser
+            calendars: List the calendar dictionaries are appended to
+        """
+        for _, response_elem in events:
+            if response_elem.tag != _RESPONSE_TAG:
+                continue
+
+            href_elem = response_elem.find(_HREF_PATH)
+            displayname_elem = response_elem.find(_DISPLAYNAME_PATH)
+            resourcetype_elem = response_elem.find(_RESOURCETYPE_PATH)
+
+            # Check if this is a calendar resource
+            if (resourcetype_elem is not None and
+                    resourcetype_elem.find(_CALENDAR_PATH) is not None):
+
+                calendar_name = displayname_elem.text if displayname_elem is not None else 'Unnamed Calendar'
+                calendar_url = href_elem.text if href_elem is not None else ''
+
+                calendars.append({
+                    'name': calendar_name,
+                    'url': urljoin(self.server_url, calendar_url),
+                    'description': f'CalDAV calendar: {calendar_name}'
+                })
+
+            # Drop the handled element's children so the tree doesn't grow
+            # with the size of the response
+            response_elem.clear()
+
+    async def create_event(self, calendar_url: str, event_data: Dict[str, Any]) -> bool:
         """
         Create a new event in the specified calendar
 
@@ -148,33 +339,14 @@ class CalDAVClient:
             event_url = f"{calendar_url.rstrip('/')}/{event_id}.ics"
 
             # Create iCalendar event
-            cal = Calendar()
-            cal.add('prodid', '-//Chroniton Capacitor//Calendar Sync//EN')
-            cal.add('version', '2.0')
-
-            event = Event()
-            event.add('uid', event_id)
-            event.add('dtstart', datetime.fromisoformat(
-                event_data['start_time'].replace('Z', '+00:00')))
-            event.add('dtend', datetime.fromisoformat(
-                event_data['end_time'].replace('Z', '+00:00')))
-            event.add('summary', vText(event_data.get('title', 'No Title')))
-            event.add('description', vText(event_data.get('description', '')))
-
-            if event_data.get('location'):
-                event.add('location', vText(event_data['location']))
-
-            event.add('dtstamp', datetime.now(timezone.utc))
-            event.add('created', datetime.now(timezone.utc))
-            event.add('last-modified', datetime.now(timezone.utc))
-
-            cal.add_component(event)
+            ics = _build_event_ics(event_id, event_data, datetime.now(timezone.utc))
 
             # Send PUT request to create event
-            response = self.session.put(
+            response = await self.http_client.put(
                 event_url,
-                data=cal.to_ical().decode('utf-8'),
-                headers={'Content-Type': 'text/calendar; charset=utf-8'}
+                content=ics,
+                headers=_ICS_HEADERS,
+                auth=self.auth
             )
 
             if response.status_code in [201, 204]:
@@ -190,7 +362,29 @@ class CalDAVClient:
             logger.error(f"Error creating CalDAV event: {e}")
             return False
 
-    def update_event(self, event_url: str, event_data: Dict[str, Any]) -> bool:
+    async def create_events(self, calendar_url: str, events_data: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Create several events in the specified calendar
+
+        CalDAV has no batch write, so the PUTs are sent concurrently, up to
+        CALDAV_WRITE_CONCURRENCY at a time, over the shared connection pool.
+
+        Args:
+            calendar_url: URL of the target calendar
+            events_data: Event data dictionaries
+
+        Returns:
+            Whether each event was created, in the same order as events_data
+        """
+        semaphore = asyncio.Semaphore(CALDAV_WRITE_CONCURRENCY)
+
+        async def create(event_data: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self.create_event(calendar_url, event_data)
+
+        return await asyncio.gather(*(create(event_data) for event_data in events_data))
+
+    async def update_event(self, event_url: str, event_data: Dict[str, Any]) -> bool:
         """
         Update an existing event
 
@@ -203,7 +397,7 @@ class CalDAVClient:
         """
         try:
             # Get existing event first to preserve UID
-            response = self.session.get(event_url)
+            response = await self.http_client.get(event_url, auth=self.auth)
             if response.status_code != 200:
                 return False
 
@@ -218,39 +412,18 @@ class CalDAVClient:
             if not existing_event:
                 return False
 
-            # Create updated calendar
-            cal = Calendar()
-            cal.add('prodid', '-//Chroniton Capacitor//Calendar Sync//EN')
-            cal.add('version', '2.0')
-
-            event = Event()
-            event.add('uid', existing_event['uid'])  # Preserve original UID
-            event.add('dtstart', datetime.fromisoformat(
-                event_data['start_time'].replace('Z', '+00:00')))
-            event.add('dtend', datetime.fromisoformat(
-                event_data['end_time'].replace('Z', '+00:00')))
-            event.add('summary', vText(event_data.get('title', 'No Title')))
-            event.add('description', vText(event_data.get('description', '')))
-
-            if event_data.get('location'):
-                event.add('location', vText(event_data['location']))
-
-            event.add('dtstamp', datetime.now(timezone.utc))
-            event.add('last-modified', datetime.now(timezone.utc))
-
-            # Preserve created timestamp if it exists
-            if 'created' in existing_event:
-                event.add('created', existing_event['created'])
-            else:
-                event.add('created', datetime.now(timezone.utc))
-
-            cal.add_component(event)
+            # Create updated calendar, preserving the original UID and
+            # created timestamp if it exists
+            ics = _build_event_ics(
+                existing_event['uid'], event_data, datetime.now(timezone.utc),
+                existing_event.get('created'))
 
             # Send PUT request to update event
-            response = self.session.put(
+            response = await self.http_client.put(
                 event_url,
-                data=cal.to_ical().decode('utf-8'),
-                headers={'Content-Type': 'text/calendar; charset=utf-8'}
+                content=ics,
+                headers=_ICS_HEADERS,
+                auth=self.auth
             )
 
             if response.status_code in [200, 204]:
@@ -266,7 +439,7 @@ class CalDAVClient:
             logger.error(f"Error updating CalDAV event: {e}")
             return False
 
-    def delete_event(self, event_url: str) -> bool:
+    async def delete_event(self, event_url: str) -> bool:
         """
         Delete an event
 
@@ -277,7 +450,7 @@ class CalDAVClient:
             True if successful, False otherwise
         """
         try:
-            response = self.session.delete(event_url)
+            response = await self.http_client.delete(event_url, auth=self.auth)
 
             if response.status_code in [200, 204]:
                 logger.info(f"Successfully deleted CalDAV event: {event_url}")
@@ -291,7 +464,7 @@ class CalDAVClient:
             logger.error(f"Error deleting CalDAV event: {e}")
             return False
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """
         Test the CalDAV connection
 
@@ -303,7 +476,8 @@ class CalDAVClient:
 
             # First try a simple OPTIONS request to test basic connectivity
             try:
-                response = self.session.options(self.server_url)
+                response = await self.http_client.options(
+                    self.server_url, auth=self.auth)
                 logger.info(f"OPTIONS request status: {response.status_code}")
                 # 405 is OK for OPTIONS
                 if response.status_code not in [200, 204, 405]:
@@ -314,7 +488,7 @@ class CalDAVClient:
                 return False
 
             # Try to discover calendars
-            calendars = self.discover_calendars()
+            calendars = await self.discover_calendars()
             logger.info(f"Discovered {len(calendars)} calendars")
 
             # Return True if we can at least connect, even if no calendars found
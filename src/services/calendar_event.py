@@ -1,8 +1,87 @@
+import logging
+import os
+import sys
 from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Optional, Any, Union
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional, Any, Union
 from pydantic import BaseModel, Field
 
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Whether events built from provider data keep the raw provider dict in
+# original_data. Off by default, since nothing reads it and holding every
+# provider payload for the life of a sync costs a lot of memory.
+KEEP_ORIGINAL_EVENT_DATA = os.environ.get("KEEP_ORIGINAL_EVENT_DATA") == "1"
+
+
+# Google event status -> common status
+_GOOGLE_STATUS_MAP = {
+    "confirmed": "confirmed",
+    "tentative": "tentative",
+    "cancelled": "cancelled"
+}
+
+# Microsoft/Exchange showAs -> common status
+_MS_SHOW_AS_STATUS_MAP = {
+    "tentative": "tentative",
+    "busy": "confirmed",
+    "free": "confirmed"  # Free time on calendar is still a confirmed event
+}
+
+# Microsoft attendee response -> common response status
+_MS_ATTENDEE_STATUS_MAP = {
+    "accepted": "accepted",
+    "declined": "declined",
+    "tentative": "tentative",
+    "notResponded": "needs_action"
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing "Z" for UTC.
+    Results are cached, since the same timestamps recur across events."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def _safe_parse_iso(value: Any, default: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, returning default if it's missing or malformed"""
+    if not value or not isinstance(value, str):
+        return default
+    try:
+        return _parse_iso(value)
+    except ValueError:
+        return default
+
+
+def _intern_status(value: Any) -> Any:
+    """Intern a status string read from provider data. Only a handful of
+    values occur, so events share one copy of each instead of holding their own."""
+    return sys.intern(value) if value and isinstance(value, str) else value
+
+
+def _convert_events(
+    convert: Callable[..., "CalendarEvent"],
+    provider_name: str,
+    events: List[Dict[str, Any]],
+    calendar_id: str,
+    calendar_name: Optional[str],
+    validate: bool
+) -> List["CalendarEvent"]:
+    """Convert provider events with one of the from_* constructors, skipping any that fail"""
+    normalized_events = []
+    append = normalized_events.append
+    for event in events:
+        try:
+            append(convert(event, calendar_id, calendar_name, validate))
+        except Exception as event_error:
+            logger.error(f"Error processing {provider_name} event {event.get('id')}: {event_error}")
+    return normalized_events
+
 
 class CalendarProvider(str, Enum):
     """Enum for supported calendar providers"""
@@ -19,37 +98,32 @@ class EventParticipant(BaseModel):
     response_status: Optional[str] = None  # accepted, declined, tentative, needs_action
     
     @classmethod
-    def from_google(cls, attendee: Dict[str, Any]) -> "EventParticipant":
-        """Create participant from Google Calendar attendee"""
-        return cls(
+    def from_google(cls, attendee: Dict[str, Any], validate: bool = True) -> "EventParticipant":
+        """
+        Create participant from Google Calendar attendee
+        Set validate=False to skip field validation for trusted API data
+        """
+        build = cls if validate else cls.model_construct
+        return build(
             email=attendee.get("email"),
             name=attendee.get("displayName"),
-            response_status=attendee.get("responseStatus")
+            response_status=_intern_status(attendee.get("responseStatus"))
         )
     
     @classmethod
-    def from_microsoft(cls, attendee: Dict[str, Any]) -> "EventParticipant":
-        """Create participant from Microsoft Graph attendee"""
-        email = None
-        name = None
-        
-        # Extract email and name based on Microsoft Graph structure
-        if "emailAddress" in attendee:
-            email = attendee["emailAddress"].get("address")
-            name = attendee["emailAddress"].get("name")
-        
-        # Map Microsoft status to common format
-        status_map = {
-            "accepted": "accepted",
-            "declined": "declined",
-            "tentative": "tentative",
-            "notResponded": "needs_action"
-        }
-        
-        return cls(
-            email=email,
-            name=name,
-            response_status=status_map.get(attendee.get("status", {}).get("response"), "needs_action")
+    def from_microsoft(cls, attendee: Dict[str, Any], validate: bool = True) -> "EventParticipant":
+        """
+        Create participant from Microsoft Graph attendee
+        Set validate=False to skip field validation for trusted API data
+        """
+        # Graph can send null as well as omit these, so fall back to {} for either
+        email_address = attendee.get("emailAddress") or {}
+        status = attendee.get("status") or {}
+        build = cls if validate else cls.model_construct
+        return build(
+            email=email_address.get("address"),
+            name=email_address.get("name"),
+            response_status=_MS_ATTENDEE_STATUS_MAP.get(status.get("response"), "needs_action")
         )
 
 
@@ -81,10 +155,14 @@ class CalendarEvent(BaseModel):
     original_data: Optional[Dict[str, Any]] = None  # Original event data
     
     @classmethod
-    def from_google(cls, event: Dict[str, Any], calendar_id: str, calendar_name: Optional[str] = None) -> "CalendarEvent":
+    def from_google(cls, event: Dict[str, Any], calendar_id: str, calendar_name: Optional[str] = None,
+                    validate: bool = True) -> "CalendarEvent":
         """
         Create a normalized CalendarEvent from Google Calendar event
+        Set validate=False to skip field validation for trusted API data
         """
+        participant = EventParticipant if validate else EventParticipant.model_construct
+
         # Extract start and end times
         start = event.get("start", {})
         end = event.get("end", {})
@@ -94,18 +172,19 @@ class CalendarEvent(BaseModel):
         
         # Get start and end times
         if all_day:
-            # For all-day events, convert date strings to datetime
-            start_dt = datetime.fromisoformat(start["date"])
-            end_dt = datetime.fromisoformat(end["date"])
+            # For all-day events, convert date strings to datetime. All-day
+            # events in a calendar share few distinct dates, so these hit the cache.
+            start_dt = _parse_iso(start["date"])
+            end_dt = _parse_iso(end["date"])
         else:
             # For timed events, use dateTime
-            start_dt = datetime.fromisoformat(start.get("dateTime", "").replace('Z', '+00:00'))
-            end_dt = datetime.fromisoformat(end.get("dateTime", "").replace('Z', '+00:00'))
+            start_dt = _parse_iso(start.get("dateTime", ""))
+            end_dt = _parse_iso(end.get("dateTime", ""))
         
         # Extract organizer
         organizer = None
         if "organizer" in event:
-            organizer = EventParticipant(
+            organizer = participant(
                 email=event["organizer"].get("email"),
                 name=event["organizer"].get("displayName"),
                 response_status="accepted"  # Organizers are implicitly accepted
@@ -114,14 +193,7 @@ class CalendarEvent(BaseModel):
         # Extract participants
         participants = []
         for attendee in event.get("attendees", []):
-            participants.append(EventParticipant.from_google(attendee))
-        
-        # Map Google status to common format
-        status_map = {
-            "confirmed": "confirmed",
-            "tentative": "tentative",
-            "cancelled": "cancelled"
-        }
+            participants.append(EventParticipant.from_google(attendee, validate))
         
         # Determine if event is recurring
         recurring = "recurrence" in event
@@ -130,7 +202,8 @@ class CalendarEvent(BaseModel):
             recurrence_pattern = event["recurrence"][0] if event["recurrence"] else None
         
         # Create the normalized event
-        return cls(
+        build = cls if validate else cls.model_construct
+        return build(
             id=f"google_{event['id']}",
             provider=CalendarProvider.GOOGLE,
             provider_id=event["id"],
@@ -148,17 +221,30 @@ class CalendarEvent(BaseModel):
             calendar_name=calendar_name,
             link=event.get("htmlLink"),
             private=event.get("visibility") == "private",
-            status=status_map.get(event.get("status")),
-            created_at=datetime.fromisoformat(event["created"].replace('Z', '+00:00')) if "created" in event else None,
-            updated_at=datetime.fromisoformat(event["updated"].replace('Z', '+00:00')) if "updated" in event else None,
-            original_data=event
+            status=_GOOGLE_STATUS_MAP.get(event.get("status")),
+            created_at=_parse_iso(event["created"]) if "created" in event else None,
+            updated_at=_parse_iso(event["updated"]) if "updated" in event else None,
+            original_data=event if KEEP_ORIGINAL_EVENT_DATA else None
         )
     
     @classmethod
-    def from_microsoft(cls, event: Dict[str, Any], calendar_id: str, calendar_name: Optional[str] = None) -> "CalendarEvent":
+    def from_google_many(cls, events: List[Dict[str, Any]], calendar_id: str, calendar_name: Optional[str] = None,
+                         validate: bool = True) -> List["CalendarEvent"]:
+        """
+        Create normalized CalendarEvents from a list of Google Calendar events
+        Events that can't be converted are logged and skipped
+        """
+        return _convert_events(cls.from_google, "Google", events, calendar_id, calendar_name, validate)
+
+    @classmethod
+    def from_microsoft(cls, event: Dict[str, Any], calendar_id: str, calendar_name: Optional[str] = None,
+                       validate: bool = True) -> "CalendarEvent":
         """
         Create a normalized CalendarEvent from Microsoft Graph event
+        Set validate=False to skip field validation for trusted API data
         """
+        participant = EventParticipant if validate else EventParticipant.model_construct
+
         # Extract start and end times
         start = event.get("start", {})
         end = event.get("end", {})
@@ -167,39 +253,25 @@ class CalendarEvent(BaseModel):
         all_day = event.get("isAllDay", False)
         
         # Get start and end times
-        start_dt = datetime.fromisoformat(start.get("dateTime", "").replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(end.get("dateTime", "").replace('Z', '+00:00'))
+        start_dt = _parse_iso(start.get("dateTime", ""))
+        end_dt = _parse_iso(end.get("dateTime", ""))
         
         # Extract organizer
         organizer = None
         if "organizer" in event:
-            organizer_data = event["organizer"]
-            organizer = EventParticipant(
-                email=organizer_data.get("emailAddress", {}).get("address"),
-                name=organizer_data.get("emailAddress", {}).get("name"),
+            email_address = event["organizer"].get("emailAddress") or {}
+            organizer = participant(
+                email=email_address.get("address"),
+                name=email_address.get("name"),
                 response_status="accepted"  # Organizers are implicitly accepted
             )
         
         # Extract participants
-        participants = []
-        for attendee in event.get("attendees", []):
-            participants.append(EventParticipant.from_microsoft(attendee))
+        from_attendee = EventParticipant.from_microsoft
+        participants = [from_attendee(attendee, validate) for attendee in event.get("attendees", [])]
         
         # Map Microsoft status to common format
-        status_map = {
-            "confirmed": "confirmed",
-            "tentative": "tentative",
-            "cancelled": "cancelled"
-        }
-        
-        ms_status = None
-        if "showAs" in event:
-            if event["showAs"] == "tentative":
-                ms_status = "tentative"
-            elif event["showAs"] == "busy":
-                ms_status = "confirmed"
-            elif event["showAs"] == "free":
-                ms_status = "confirmed"  # Free time on calendar is still a confirmed event
+        ms_status = _MS_SHOW_AS_STATUS_MAP.get(event.get("showAs"))
         
         # Check if event is cancelled
         if event.get("isCancelled", False):
@@ -208,17 +280,18 @@ class CalendarEvent(BaseModel):
         # Determine if event is recurring
         recurring = event.get("recurrence", None) is not None
         recurrence_pattern = None
-        if recurring and event.get("recurrence", {}).get("pattern"):
-            recurrence_pattern = str(event["recurrence"]["pattern"])
+        if recurring and (pattern := event["recurrence"].get("pattern")):
+            recurrence_pattern = str(pattern)
         
         # Create the normalized event
-        return cls(
+        build = cls if validate else cls.model_construct
+        return build(
             id=f"microsoft_{event['id']}",
             provider=CalendarProvider.MICROSOFT,
             provider_id=event["id"],
             title=event.get("subject", "Untitled Event"),
             description=event.get("bodyPreview"),
-            location=event.get("location", {}).get("displayName"),
+            location=(event.get("location") or {}).get("displayName"),
             start_time=start_dt,
             end_time=end_dt,
             all_day=all_day,
@@ -231,16 +304,29 @@ class CalendarEvent(BaseModel):
             link=event.get("webLink"),
             private=event.get("sensitivity") == "private",
             status=ms_status,
-            created_at=datetime.fromisoformat(event["createdDateTime"].replace('Z', '+00:00')) if "createdDateTime" in event else None,
-            updated_at=datetime.fromisoformat(event["lastModifiedDateTime"].replace('Z', '+00:00')) if "lastModifiedDateTime" in event else None,
-            original_data=event
+            created_at=_parse_iso(event["createdDateTime"]) if "createdDateTime" in event else None,
+            updated_at=_parse_iso(event["lastModifiedDateTime"]) if "lastModifiedDateTime" in event else None,
+            original_data=event if KEEP_ORIGINAL_EVENT_DATA else None
         )
         
     @classmethod
-    def from_exchange(cls, event: Dict[str, Any], calendar_id: str, calendar_name: Optional[str] = None) -> "CalendarEvent":
+    def from_microsoft_many(cls, events: List[Dict[str, Any]], calendar_id: str, calendar_name: Optional[str] = None,
+                            validate: bool = True) -> List["CalendarEvent"]:
+        """
+        Create normalized CalendarEvents from a list of Microsoft Graph events
+        Events that can't be converted are logged and skipped
+        """
+        return _convert_events(cls.from_microsoft, "Microsoft", events, calendar_id, calendar_name, validate)
+
+    @classmethod
+    def from_exchange(cls, event: Dict[str, Any], calendar_id: str, calendar_name: Optional[str] = None,
+                      validate: bool = True) -> "CalendarEvent":
         """
         Create a normalized CalendarEvent from Exchange/Mailcow ActiveSync event
+        Set validate=False to skip field validation for trusted API data
         """
+        participant = EventParticipant if validate else EventParticipant.model_construct
+
         # Extract start and end times
         start = event.get("start", {})
         end = event.get("end", {})
@@ -249,40 +335,26 @@ class CalendarEvent(BaseModel):
         all_day = event.get("isAllDay", False)
         
         # Get start and end times
-        start_dt = datetime.fromisoformat(start.get("dateTime", "").replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(end.get("dateTime", "").replace('Z', '+00:00'))
+        start_dt = _parse_iso(start.get("dateTime", ""))
+        end_dt = _parse_iso(end.get("dateTime", ""))
         
         # Extract organizer
         organizer = None
         if "organizer" in event:
-            organizer_data = event["organizer"]
-            organizer = EventParticipant(
-                email=organizer_data.get("emailAddress", {}).get("address"),
-                name=organizer_data.get("emailAddress", {}).get("name"),
+            email_address = event["organizer"].get("emailAddress") or {}
+            organizer = participant(
+                email=email_address.get("address"),
+                name=email_address.get("name"),
                 response_status="accepted"  # Organizers are implicitly accepted
             )
         
         # Extract participants
-        participants = []
-        for attendee in event.get("attendees", []):
-            # Exchange attendees follow a similar format to Microsoft Graph
-            participants.append(EventParticipant.from_microsoft(attendee))
+        # Exchange attendees follow a similar format to Microsoft Graph
+        from_attendee = EventParticipant.from_microsoft
+        participants = [from_attendee(attendee, validate) for attendee in event.get("attendees", [])]
         
         # Map Exchange status to common format
-        status_map = {
-            "confirmed": "confirmed",
-            "tentative": "tentative",
-            "cancelled": "cancelled"
-        }
-        
-        ex_status = None
-        if "showAs" in event:
-            if event["showAs"] == "tentative":
-                ex_status = "tentative"
-            elif event["showAs"] == "busy":
-                ex_status = "confirmed"
-            elif event["showAs"] == "free":
-                ex_status = "confirmed"  # Free time on calendar is still a confirmed event
+        ex_status = _MS_SHOW_AS_STATUS_MAP.get(event.get("showAs"))
         
         # Check if event is cancelled
         if event.get("isCancelled", False):
@@ -291,17 +363,18 @@ class CalendarEvent(BaseModel):
         # Determine if event is recurring
         recurring = event.get("recurrence", None) is not None
         recurrence_pattern = None
-        if recurring and event.get("recurrence", {}).get("pattern"):
-            recurrence_pattern = str(event["recurrence"]["pattern"])
+        if recurring and (pattern := event["recurrence"].get("pattern")):
+            recurrence_pattern = str(pattern)
         
         # Create the normalized event
-        return cls(
+        build = cls if validate else cls.model_construct
+        return build(
             id=f"exchange_{event['id']}",
             provider=CalendarProvider.EXCHANGE,
             provider_id=event["id"],
             title=event.get("subject", "Untitled Event"),
             description=event.get("bodyPreview"),
-            location=event.get("location", {}).get("displayName"),
+            location=(event.get("location") or {}).get("displayName"),
             start_time=start_dt,
             end_time=end_dt,
             all_day=all_day,
@@ -314,28 +387,31 @@ class CalendarEvent(BaseModel):
             link=event.get("webLink"),
             private=event.get("sensitivity") == "private",
             status=ex_status,
-            created_at=datetime.fromisoformat(event["createdDateTime"].replace('Z', '+00:00')) if "createdDateTime" in event else None,
-            updated_at=datetime.fromisoformat(event["lastModifiedDateTime"].replace('Z', '+00:00')) if "lastModifiedDateTime" in event else None,
-            original_data=event
+            created_at=_parse_iso(event["createdDateTime"]) if "createdDateTime" in event else None,
+            updated_at=_parse_iso(event["lastModifiedDateTime"]) if "lastModifiedDateTime" in event else None,
+            original_data=event if KEEP_ORIGINAL_EVENT_DATA else None
         )
         
+    @classmethod
+    def from_exchange_many(cls, events: List[Dict[str, Any]], calendar_id: str, calendar_name: Optional[str] = None,
+                           validate: bool = True) -> List["CalendarEvent"]:
+        """
+        Create normalized CalendarEvents from a list of Exchange/Mailcow events
+        Events that can't be converted are logged and skipped
+        """
+        return _convert_events(cls.from_exchange, "Exchange", events, calendar_id, calendar_name, validate)
+
     @classmethod
     def from_outlook_mac(cls, event: Dict[str, Any], calendar_id: str, calendar_name: Optional[str] = None) -> "CalendarEvent":
         """
         Create a normalized CalendarEvent from Outlook Mac .olk15Event data
         """
         # Parse start and end times from ISO format
-        start_time_str = event.get("start_time", "")
-        end_time_str = event.get("end_time", "")
-        
-        try:
-            start_dt = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-        except:
+        start_dt = _safe_parse_iso(event.get("start_time"))
+        if start_dt is None:
             start_dt = datetime.utcnow()
-            
-        try:
-            end_dt = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
-        except:
+        end_dt = _safe_parse_iso(event.get("end_time"))
+        if end_dt is None:
             end_dt = start_dt
         
         # Extract organizer
@@ -357,24 +433,12 @@ class CalendarEvent(BaseModel):
                     participants.append(EventParticipant(
                         email=participant.get("email"),
                         name=participant.get("name"),
-                        response_status=participant.get("status", "needs_action")
+                        response_status=_intern_status(participant.get("status", "needs_action"))
                     ))
         
         # Parse created/updated timestamps
-        created_at = None
-        updated_at = None
-        
-        try:
-            if event.get("created_at"):
-                created_at = datetime.fromisoformat(event["created_at"].replace('Z', '+00:00'))
-        except:
-            pass
-            
-        try:
-            if event.get("modified_at"):
-                updated_at = datetime.fromisoformat(event["modified_at"].replace('Z', '+00:00'))
-        except:
-            pass
+        created_at = _safe_parse_iso(event.get("created_at"))
+        updated_at = _safe_parse_iso(event.get("modified_at"))
         
         # Create the normalized event
         return cls(
@@ -395,8 +459,8 @@ class CalendarEvent(BaseModel):
             calendar_name=calendar_name or event.get("calendar_name"),
             link=None,
             private=event.get("private", False),
-            status=event.get("status", "confirmed"),
+            status=_intern_status(event.get("status", "confirmed")),
             created_at=created_at,
             updated_at=updated_at,
-            original_data=event
+            original_data=event if KEEP_ORIGINAL_EVENT_DATA else None
         )
\ No newline at end of file
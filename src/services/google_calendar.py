@@ -1,7 +1,11 @@
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import httplib2
+from tenacity import (
+    retry, stop_after_attempt, wait_exponential, retry_if_exception, retry_if_exception_type
+)
 from googleapiclient.errors import HttpError
 
 from auth.google_auth import GoogleCalendarAuth
@@ -10,6 +14,19 @@ from services.calendar_event import CalendarEvent, CalendarProvider
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Google's batch endpoint accepts at most 50 sub-requests per call
+GOOGLE_BATCH_SIZE = 50
+
+# Times an insert that failed inside a batch with a retryable error is sent
+GOOGLE_BATCH_ATTEMPTS = 3
+
+
+def _is_retryable(exception: BaseException) -> bool:
+    """Whether a failed Google API request may succeed if sent again"""
+    if isinstance(exception, HttpError):
+        return exception.resp.status == 429 or exception.resp.status >= 500
+    return isinstance(exception, (OSError, httplib2.HttpLib2Error))
+
 class GoogleCalendarService:
     def __init__(self):
         """Initialize the Google Calendar service"""
@@ -118,17 +135,9 @@ class GoogleCalendarService:
             calendar_details = service.calendars().get(calendarId=calendar_id).execute()
             calendar_name = calendar_details.get('summary', 'Unknown Calendar')
             
-            # Process events
-            normalized_events = []
-            for event in events_result.get('items', []):
-                try:
-                    normalized_events.append(
-                        CalendarEvent.from_google(event, calendar_id, calendar_name)
-                    )
-                except Exception as event_error:
-                    logger.error(f"Error processing Google event {event.get('id')}: {event_error}")
-                    # Continue with next event
-                    continue
+            # Process events, skipping any that can't be converted
+            normalized_events = CalendarEvent.from_google_many(
+                events_result.get('items', []), calendar_id, calendar_name, validate=False)
             
             # Return the events and next sync token
             return {
@@ -200,6 +209,105 @@ class GoogleCalendarService:
             logger.error(f"Unexpected error creating Google calendar event: {e}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True
+    )
+    async def _execute_batch(
+        self,
+        service: Any,
+        calendar_id: str,
+        events_data: List[Dict[str, Any]],
+        indexes: List[int]
+    ) -> Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Send the inserts for events_data[i], for each i in indexes, as one batch
+
+        A fresh batch is built for every attempt, so retrying a failed batch
+        call doesn't depend on the state a failed execute() left behind.
+
+        Returns:
+            (created event, None) or (None, exception) for each index
+        """
+        results = {}
+
+        def on_response(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+
+        batch = service.new_batch_http_request(callback=on_response)
+        for index in indexes:
+            batch.add(
+                service.events().insert(calendarId=calendar_id, body=events_data[index]),
+                request_id=str(index)
+            )
+        batch.execute()
+        return results
+
+    async def create_events(
+        self,
+        token_info: Dict[str, str],
+        calendar_id: str,
+        events_data: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Create several events in Google Calendar using batch requests
+
+        Inserts are sent GOOGLE_BATCH_SIZE at a time as a single batch call
+        each, with the same retry policy as create_event. Inserts that fail
+        inside a batch with a retryable error (429, 5xx or a connection
+        error) are sent again in a later batch, up to GOOGLE_BATCH_ATTEMPTS
+        times. Events that still fail are logged and left as None, rather
+        than failing the whole call.
+
+        Args:
+            token_info: Google OAuth tokens
+            calendar_id: ID of the calendar to create events in
+            events_data: Events in Google Calendar format
+
+        Returns:
+            Created event data, or None where the insert failed, in the
+            same order as events_data
+        """
+        service = await self.auth.get_calendar_service(token_info)
+        created_events: List[Optional[Dict[str, Any]]] = [None] * len(events_data)
+        errors: Dict[int, Exception] = {}
+        pending = list(range(len(events_data)))
+
+        for attempt in range(GOOGLE_BATCH_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(min(4 * 2 ** (attempt - 1), 10))
+            retry_indexes = []
+            for start in range(0, len(pending), GOOGLE_BATCH_SIZE):
+                indexes = pending[start:start + GOOGLE_BATCH_SIZE]
+                try:
+                    results = await self._execute_batch(service, calendar_id, events_data, indexes)
+                except Exception as e:
+                    logger.error(f"Batched inserts into calendar {calendar_id} failed: {e}")
+                    results = {index: (None, e) for index in indexes}
+
+                for index in indexes:
+                    response, exception = results.get(
+                        index, (None, RuntimeError("No response in batch")))
+                    if exception is None:
+                        created_events[index] = response
+                        errors.pop(index, None)
+                    else:
+                        errors[index] = exception
+                        if _is_retryable(exception):
+                            retry_indexes.append(index)
+            pending = retry_indexes
+            if not pending:
+                break
+
+        for index, exception in sorted(errors.items()):
+            logger.error(f"Could not create event {index} in calendar {calendar_id}: {exception}")
+
+        logger.info(f"Created {len(events_data) - len(errors)} of {len(events_data)} "
+                    f"events in calendar {calendar_id}")
+        return created_events
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
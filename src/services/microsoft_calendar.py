@@ -124,19 +124,9 @@ class MicrosoftCalendarService:
             calendar_details = calendar_response.json()
             calendar_name = calendar_details.get('name', 'Unknown Calendar')
 
-            # Process events
-            normalized_events = []
-            for event in events_data:
-                try:
-                    normalized_events.append(
-                        CalendarEvent.from_microsoft(
-                            event, calendar_id, calendar_name)
-                    )
-                except Exception as event_error:
-                    logger.error(
-                        f"Error processing Microsoft event {event.get('id')}: {event_error}")
-                    # Continue with next event
-                    continue
+            # Process events, skipping any that can't be converted
+            normalized_events = CalendarEvent.from_microsoft_many(
+                events_data, calendar_id, calendar_name, validate=False)
 
             # Extract the delta link from @odata.nextLink or @odata.deltaLink
             next_link = data.get('@odata.nextLink')
@@ -525,15 +525,13 @@ class UnifiedCalendarService:
             created_events = []
             
             if provider == CalendarProvider.GOOGLE.value:
-                for event in events:
-                    # Convert to Google format
-                    google_event_data = self.google_service.convert_calendar_event_to_google_format(event)
-                    
-                    # Create the event
-                    created_event = await self.google_service.create_event(
-                        credentials, calendar_id, google_event_data
-                    )
-                    created_events.append(created_event)
+                # Convert to Google format and create through batch requests
+                convert = self.google_service.convert_calendar_event_to_google_format
+                results = await self.google_service.create_events(
+                    credentials, calendar_id, [convert(event) for event in events]
+                )
+                # Failed inserts come back as None and have already been logged
+                created_events = [created for created in results if created is not None]
                     
             elif provider == CalendarProvider.MICROSOFT.value:
                 for event in events:
@@ -560,17 +558,20 @@ class UnifiedCalendarService:
                     password=credentials.get('password')
                 )
                 
-                for event in events:
-                    # Convert CalendarEvent to dict format for CalDAV
-                    event_data = {
+                # Convert CalendarEvents to dict format for CalDAV
+                events_data = [
+                    {
                         'title': event.title,
                         'description': event.description,
                         'start_time': event.start_time,
                         'end_time': event.end_time,
                         'location': event.location
                     }
-                    
-                    success = caldav_client.create_event(calendar_id, event_data)
+                    for event in events
+                ]
+
+                results = await caldav_client.create_events(calendar_id, events_data)
+                for event, success in zip(events, results):
                     if success:
                         created_events.append({
                             'id': f"caldav-{event.id}",
@@ -640,7 +641,8 @@ class UnifiedCalendarService:
                 }
                 
                 # For CalDAV, event_id should be the full event URL
-                success = caldav_client.update_event(event_id, event_data)
+                success = await caldav_client.update_event(
+                    event_id, event_data)
                 if success:
                     return {
                         'id': event_id,
@@ -694,7 +696,7 @@ class UnifiedCalendarService:
                 )
                 
                 # For CalDAV, event_id should be the full event URL
-                return caldav_client.delete_event(event_id)
+                return await caldav_client.delete_event(event_id)
                 
             else:
                 raise ValueError(f"Unsupported provider for destination: {provider}")
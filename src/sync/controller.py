@@ -8,7 +8,8 @@ into a single destination calendar.
 import logging
 import asyncio
 import json
-from typing import List, Dict, Any, Optional, Set
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 
@@ -23,6 +24,18 @@ from sync.storage import SyncStorageManager
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Raw events are parsed in chunks of this size, yielding to the event loop
+# between chunks so a large import doesn't stall other requests
+EVENT_PARSE_CHUNK_SIZE = 1000
+
+# Seconds a configuration loaded for read-only use is reused before storage
+# is read again, which picks up changes written by other processes
+CONFIG_CACHE_TTL = 5.0
+
+# Most sources synced at once by sync_all_calendars, to stay within the
+# providers' API quotas
+SOURCE_SYNC_CONCURRENCY = 8
+
 
 class CalendarSyncController:
     """
@@ -34,54 +47,104 @@ class CalendarSyncController:
         self.storage = storage_manager
         self.unified_service = UnifiedCalendarService()
         self.active_syncs = set()  # Track active sync operations
+        # Bumped on every save so callers can tell when cached config is stale
+        self.config_version = 0
+        # (config version, expiry, configuration) for read_configuration
+        self._config_cache: Optional[Tuple[int, float, SyncConfiguration]] = None
+        self._config_cache_lock = asyncio.Lock()
+        # Serialises read-modify-write updates of the configuration, so a
+        # concurrent update, such as a source sync recording its last sync
+        # time, can't be overwritten by one that loaded the config earlier
+        self.config_update_lock = asyncio.Lock()
 
     async def load_configuration(self) -> SyncConfiguration:
         """Load synchronization configuration from storage"""
         config_data = await self.storage.get_sync_configuration()
         if not config_data:
             # Return a default configuration if none exists
-            return SyncConfiguration(
+            config = SyncConfiguration(
                 sources=[],
                 agents=[],
                 destination=None
             )
+        else:
+            config = SyncConfiguration.parse_obj(config_data)
+        return config
 
-        return SyncConfiguration.parse_obj(config_data)
+    async def read_configuration(self) -> SyncConfiguration:
+        """
+        Load the configuration for read-only use, reusing a recent load.
+        The returned object is shared between callers and must not be
+        modified; use load_configuration() to get a copy to edit and save.
+        """
+        cached = self._config_cache
+        if (cached is not None and cached[0] == self.config_version
+                and time.monotonic() < cached[1]):
+            return cached[2]
+
+        async with self._config_cache_lock:
+            cached = self._config_cache
+            if (cached is not None and cached[0] == self.config_version
+                    and time.monotonic() < cached[1]):
+                return cached[2]
+
+            # Tag with the version from before the load, so a save that
+            # lands while we're reading leaves this entry already stale
+            version = self.config_version
+            config = await self.load_configuration()
+            self._config_cache = (version, time.monotonic() + CONFIG_CACHE_TTL, config)
+            return config
 
     async def save_configuration(self, config: SyncConfiguration) -> None:
         """Save synchronization configuration to storage"""
-        await self.storage.save_sync_configuration(config.dict())
+        config_dict = config.dict()
+        await self.storage.save_sync_configuration(config_dict)
+        self.config_version += 1
 
     async def add_sync_source(self, source: SyncSource) -> SyncSource:
         """Add a new synchronization source"""
-        config = await self.load_configuration()
+        async with self.config_update_lock:
+            config = await self.load_configuration()
 
-        # Check for duplicate IDs
-        if any(s.id == source.id for s in config.sources):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Source with ID {source.id} already exists"
-            )
+            # Check for duplicate IDs
+            if any(s.id == source.id for s in config.sources):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Source with ID {source.id} already exists"
+                )
 
-        # Add the new source
-        config.sources.append(source)
-        await self.save_configuration(config)
+            # Add the new source
+            config.sources.append(source)
+            await self.save_configuration(config)
         return source
 
-    async def update_sync_source(self, source_id: str, updates: Dict[str, Any]) -> SyncSource:
-        """Update an existing synchronization source"""
-        config = await self.load_configuration()
-
-        # Find the source to update
-        for i, source in enumerate(config.sources):
-            if source.id == source_id:
-                # Update the source
-                source_dict = source.dict()
-                source_dict.update(updates)
-                updated_source = SyncSource.parse_obj(source_dict)
-                config.sources[i] = updated_source
-                await self.save_configuration(config)
-                return updated_source
+    async def update_sync_source(
+        self,
+        source_id: str,
+        updates: Dict[str, Any],
+        validate: bool = True
+    ) -> SyncSource:
+        """
+        Update an existing synchronization source.
+        Pass validate=False only for updates the controller built itself,
+        which are applied without re-validating the whole source.
+        """
+        async with self.config_update_lock:
+            config = await self.load_configuration()
+
+            # Find the source to update
+            for i, source in enumerate(config.sources):
+                if source.id == source_id:
+                    # Update the source
+                    if validate:
+                        source_dict = source.dict()
+                        source_dict.update(updates)
+                        updated_source = SyncSource.parse_obj(source_dict)
+                    else:
+                        updated_source = source.model_copy(update=updates)
+                    config.sources[i] = updated_source
+                    await self.save_configuration(config)
+                    return updated_source
 
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -90,14 +153,15 @@ class CalendarSyncController:
 
     async def remove_sync_source(self, source_id: str) -> None:
         """Remove a synchronization source"""
-        config = await self.load_configuration()
+        async with self.config_update_lock:
+            config = await self.load_configuration()
 
-        # Find and remove the source
-        for i, source in enumerate(config.sources):
-            if source.id == source_id:
-                config.sources.pop(i)
-                await self.save_configuration(config)
-                return
+            # Find and remove the source
+            for i, source in enumerate(config.sources):
+                if source.id == source_id:
+                    config.sources.pop(i)
+                    await self.save_configuration(config)
+                    return
 
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,26 +170,27 @@ class CalendarSyncController:
 
     async def configure_destination(self, destination: SyncDestination) -> SyncDestination:
         """Configure the synchronization destination"""
-        config = await self.load_configuration()
-
-        # If using separate calendars for sources, set up those calendars
-        if destination.color_management == "separate_calendar":
-            for source in config.sources:
-                if source.enabled:
-                    # Create a new calendar in the destination for this source if not already created
-                    if source.id not in destination.source_calendars:
-                        try:
-                            new_calendar_id = await self._create_calendar_for_source(destination, source)
-                            # Store the mapping of source to destination calendar
-                            destination.source_calendars[source.id] = new_calendar_id
-                            logger.info(
-                                f"Created new calendar for source {source.name} with ID {new_calendar_id}")
-                        except Exception as e:
-                            logger.error(
-                                f"Error creating calendar for source {source.name}: {e}")
+        async with self.config_update_lock:
+            config = await self.load_configuration()
 
-        config.destination = destination
-        await self.save_configuration(config)
+            # If using separate calendars for sources, set up those calendars
+            if destination.color_management == "separate_calendar":
+                for source in config.sources:
+                    if source.enabled:
+                        # Create a new calendar in the destination for this source if not already created
+                        if source.id not in destination.source_calendars:
+                            try:
+                                new_calendar_id = await self._create_calendar_for_source(destination, source)
+                                # Store the mapping of source to destination calendar
+                                destination.source_calendars[source.id] = new_calendar_id
+                                logger.info(
+                                    f"Created new calendar for source {source.name} with ID {new_calendar_id}")
+                            except Exception as e:
+                                logger.error(
+                                    f"Error creating calendar for source {source.name}: {e}")
+
+            config.destination = destination
+            await self.save_configuration(config)
         return destination
 
     async def _create_calendar_for_source(self, destination: SyncDestination, source: SyncSource) -> str:
@@ -171,22 +236,23 @@ class CalendarSyncController:
 
     async def add_sync_agent(self, agent: SyncAgentConfig) -> SyncAgentConfig:
         """Add a new synchronization agent"""
-        config = await self.load_configuration()
+        async with self.config_update_lock:
+            config = await self.load_configuration()
 
-        # Initialize agents list if it's None
-        if config.agents is None:
-            config.agents = []
+            # Initialize agents list if it's None
+            if config.agents is None:
+                config.agents = []
 
-        # Check for duplicate IDs
-        if any(a.id == agent.id for a in config.agents):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Agent with ID {agent.id} already exists"
-            )
+            # Check for duplicate IDs
+            if any(a.id == agent.id for a in config.agents):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Agent with ID {agent.id} already exists"
+                )
 
-        # Add the new agent
-        config.agents.append(agent)
-        await self.save_configuration(config)
+            # Add the new agent
+            config.agents.append(agent)
+            await self.save_configuration(config)
         return agent
 
     async def sync_all_calendars(self) -> Dict[str, Any]:
@@ -216,21 +282,25 @@ class CalendarSyncController:
                 "end_time": None
             }
 
-            # Process each source
-            for source in config.sources:
-                if not source.enabled:
-                    continue
+            # Process the enabled sources concurrently, a bounded number at a time
+            semaphore = asyncio.Semaphore(SOURCE_SYNC_CONCURRENCY)
 
-                try:
-                    # Sync this source
-                    source_result = await self.sync_single_source(source.id)
-                    results["sources_synced"] += 1
-                    results["events_synced"] += source_result.get(
-                        "events_synced", 0)
-                except Exception as e:
-                    error_msg = f"Error syncing source {source.id}: {str(e)}"
-                    logger.error(error_msg)
-                    results["errors"].append(error_msg)
+            async def sync_source(source_id: str) -> None:
+                async with semaphore:
+                    try:
+                        source_result = await self.sync_single_source(source_id)
+                    except Exception as e:
+                        error_msg = f"Error syncing source {source_id}: {str(e)}"
+                        logger.error(error_msg)
+                        results["errors"].append(error_msg)
+                        return
+
+                results["sources_synced"] += 1
+                results["events_synced"] += source_result.get(
+                    "events_synced", 0)
+
+            await asyncio.gather(
+                *(sync_source(source.id) for source in config.sources if source.enabled))
 
             # Also process agent events from heartbeats
             try:
@@ -318,7 +388,8 @@ class CalendarSyncController:
 
             # Update source last sync time
             source.last_sync = datetime.utcnow()
-            await self.update_sync_source(source_id, {"last_sync": source.last_sync})
+            await self.update_sync_source(
+                source_id, {"last_sync": source.last_sync}, validate=False)
 
             # Update completion time
             results["end_time"] = datetime.utcnow().isoformat()
@@ -398,15 +469,7 @@ class CalendarSyncController:
             return []
 
         # Convert to CalendarEvent objects
-        events = []
-        for event_data in events_data:
-            try:
-                events.append(CalendarEvent.parse_obj(event_data))
-            except Exception as e:
-                logger.error(f"Error parsing event from agent cache: {e}")
-                # Continue with other events
-
-        return events
+        return await self._parse_events(events_data, "agent cache")
 
     async def _get_events_from_import(self, source: SyncSource) -> List[CalendarEvent]:
         """Get events from an import file or email"""
@@ -417,13 +480,20 @@ class CalendarSyncController:
         # Parse the import data based on format
         # This would need custom parsers for different formats (iCal, CSV, etc.)
         # For simplicity, we'll assume the data is already in the right format
+        return await self._parse_events(import_data, "import")
+
+    async def _parse_events(self, events_data: List[Dict[str, Any]], origin: str) -> List[CalendarEvent]:
+        """Parse raw event dicts into CalendarEvent objects, skipping invalid ones"""
         events = []
-        for event_data in import_data:
-            try:
-                events.append(CalendarEvent.parse_obj(event_data))
-            except Exception as e:
-                logger.error(f"Error parsing event from import: {e}")
-                # Continue with other events
+        for start in range(0, len(events_data), EVENT_PARSE_CHUNK_SIZE):
+            for event_data in events_data[start:start + EVENT_PARSE_CHUNK_SIZE]:
+                try:
+                    events.append(CalendarEvent.parse_obj(event_data))
+                except Exception as e:
+                    logger.error(f"Error parsing event from {origin}: {e}")
+                    # Continue with other events
+
+            await asyncio.sleep(0)
 
         return events
 
@@ -722,7 +792,7 @@ class CalendarSyncController:
 
     async def check_agent_heartbeats(self) -> Dict[str, Any]:
         """Check for active sync agents and their status"""
-        config = await self.load_configuration()
+        config = await self.read_configuration()
 
         results = {
             "total_agents": len(config.agents),
@@ -757,31 +827,32 @@ class CalendarSyncController:
 
     async def register_agent_heartbeat(self, agent_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Register a heartbeat from a sync agent"""
-        config = await self.load_configuration()
+        async with self.config_update_lock:
+            config = await self.load_configuration()
 
-        # Find the agent
-        agent = next((a for a in config.agents if a.id == agent_id), None)
-        if not agent:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Agent with ID {agent_id} not found"
-            )
+            # Find the agent
+            agent = next((a for a in config.agents if a.id == agent_id), None)
+            if not agent:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Agent with ID {agent_id} not found"
+                )
 
-        # Update last check-in time
-        agent.last_check_in = datetime.utcnow()
+            # Update last check-in time
+            agent.last_check_in = datetime.utcnow()
 
-        # Check if agent sent events
-        if "events" in data:
-            # Store events in cache
-            await self.storage.save_agent_events(agent_id, data["events"])
+            # Check if agent sent events
+            if "events" in data:
+                # Store events in cache
+                await self.storage.save_agent_events(agent_id, data["events"])
 
-        # Save updated agent config
-        for i, a in enumerate(config.agents):
-            if a.id == agent_id:
-                config.agents[i] = agent
-                break
+            # Save updated agent config
+            for i, a in enumerate(config.agents):
+                if a.id == agent_id:
+                    config.agents[i] = agent
+                    break
 
-        await self.save_configuration(config)
+            await self.save_configuration(config)
 
         # Check for pending updates for this agent
         pending_updates = await self.get_pending_updates_for_agent(agent_id)
@@ -0,0 +1,258 @@
+"""
+Agent Event Store
+
+This module provides the in-memory store for events reported by remote agents.
+It behaves like a dict of agent ID -> event list, but keeps running totals so
+statistics don't have to walk every stored event, and keeps each agent's
+events ordered by start time so they can be merged without re-sorting, or
+searched by time range.
+The number of events kept per agent can be capped to bound memory use.
+
+Alongside the raw event dicts, which are returned to clients as reported,
+the store keeps a slotted AgentEvent per event with display defaults
+already applied, for the views that read the same fields on every event.
+"""
+
+import heapq
+import logging
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import MutableMapping
+from datetime import timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from services.calendar_event import _parse_iso
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """
+    Seconds since the epoch for an ISO 8601 time, or None if it can't be parsed.
+    A trailing "Z" is accepted, and times without a UTC offset are taken to be UTC.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = _parse_iso(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class AgentEvent:
+    """Display fields of a stored event, with defaults applied once on store"""
+
+    __slots__ = (
+        "event", "start_epoch", "end_epoch", "sort_key",
+        "id", "title", "start_time", "end_time", "all_day", "description",
+        "location", "provider", "calendar_name", "status", "organizer",
+        "participants"
+    )
+
+    def __init__(self, event: Dict[str, Any]):
+        get = event.get
+        self.event = event
+        self.start_epoch = _epoch(get("start_time"))
+        self.end_epoch = _epoch(get("end_time"))
+        # Events without a usable start time sort first
+        self.sort_key = self.start_epoch if self.start_epoch is not None else float("-inf")
+        self.id = get("id")
+        self.title = get("title", "Untitled Event")
+        self.start_time = get("start_time")
+        self.end_time = get("end_time")
+        self.all_day = get("all_day", False)
+        self.description = get("description", "")
+        self.location = get("location", "")
+        self.provider = get("provider", "unknown")
+        self.calendar_name = get("calendar_name", "")
+        self.status = get("status", "confirmed")
+        self.organizer = get("organizer", {})
+        self.participants = get("participants", [])
+
+
+def _sort_key(event: AgentEvent) -> float:
+    """Sort key for events, ordering them by start time"""
+    return event.sort_key
+
+
+def _tag_events(agent_id: str, events: List[AgentEvent]) -> Iterator[Tuple[float, str, Dict[str, Any]]]:
+    """Pair each event with its sort key and the agent that reported it"""
+    for event in events:
+        yield event.sort_key, agent_id, event.event
+
+
+class EventStore(MutableMapping):
+    """
+    Events reported by each agent, keyed by agent ID.
+    Assigning an agent's events replaces whatever it reported before,
+    and stores them sorted by start time. If max_events_per_agent is set,
+    only that many of the latest events are kept for each agent, dropping
+    events without a usable start time first.
+    Start times are compared as instants, so events reported with
+    different UTC offsets still sort correctly.
+    """
+
+    def __init__(self, max_events_per_agent: Optional[int] = None):
+        self._max_events_per_agent = max_events_per_agent
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        self._agent_events: Dict[str, List[AgentEvent]] = {}
+        # Sort key of each agent's events, in the same order, for bisecting
+        self._sort_keys: Dict[str, List[float]] = {}
+        # Longest event each agent reported, in seconds, which bounds how far
+        # before a time range an overlapping event can start
+        self._max_durations: Dict[str, float] = {}
+        self._total_events = 0
+        self._provider_counts: Counter = Counter()
+        # Bumped on every change, so callers can tell when derived data is stale
+        self._version = 0
+        # Merged, agent-tagged event list, rebuilt on first use after a change
+        self._all_events: Optional[List[Dict[str, Any]]] = None
+
+    def __getitem__(self, agent_id: str) -> List[Dict[str, Any]]:
+        return self._events[agent_id]
+
+    def __setitem__(self, agent_id: str, events: List[Dict[str, Any]]) -> None:
+        # Build the new list and its totals before touching any state, so a
+        # bad payload leaves the agent's previous events and the totals as they were
+        if not isinstance(events, list):
+            raise TypeError(f"Events must be a list, not {type(events).__name__}")
+        agent_events = sorted(
+            (AgentEvent(event) for event in events if isinstance(event, dict)),
+            key=_sort_key)
+        skipped = len(events) - len(agent_events)
+        if skipped:
+            logger.warning(
+                "Agent %s reported %d events that are not objects, skipping them",
+                agent_id, skipped)
+        limit = self._max_events_per_agent
+        if limit is not None and len(agent_events) > limit:
+            # Undated events sort first, so they go before any dated event,
+            # then the earliest ones, keeping the upcoming events the feeds show
+            logger.warning(
+                "Agent %s reported %d events, keeping the latest %d",
+                agent_id, len(agent_events), limit)
+            del agent_events[:len(agent_events) - limit]
+        events = [event.event for event in agent_events]
+        provider_counts = Counter(event.provider for event in agent_events)
+        max_duration = max(
+            (event.end_epoch - event.start_epoch for event in agent_events
+             if event.start_epoch is not None and event.end_epoch is not None),
+            default=0.0
+        )
+
+        self._changed()
+        previous = self._events.get(agent_id)
+        if previous is not None:
+            self._forget(previous)
+        self._events[agent_id] = events
+        self._agent_events[agent_id] = agent_events
+        self._sort_keys[agent_id] = [event.sort_key for event in agent_events]
+        self._max_durations[agent_id] = max_duration
+        self._total_events += len(events)
+        self._provider_counts.update(provider_counts)
+
+    def __delitem__(self, agent_id: str) -> None:
+        self._forget(self._events.pop(agent_id))
+        del self._agent_events[agent_id]
+        del self._sort_keys[agent_id]
+        del self._max_durations[agent_id]
+        self._changed()
+
+    def _changed(self) -> None:
+        """Record a change to the stored events"""
+        self._version += 1
+        self._all_events = None
+
+    def _forget(self, events: List[Dict[str, Any]]) -> None:
+        """Remove events from the running totals"""
+        self._total_events -= len(events)
+        self._provider_counts.subtract(
+            event.get("provider", "unknown") for event in events)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._events
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._agent_events.clear()
+        self._sort_keys.clear()
+        self._max_durations.clear()
+        self._total_events = 0
+        self._provider_counts.clear()
+        self._changed()
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever any agent's events change"""
+        return self._version
+
+    @property
+    def total_events(self) -> int:
+        """Number of events stored across all agents"""
+        return self._total_events
+
+    def provider_counts(self) -> Dict[str, int]:
+        """Number of events stored for each calendar provider"""
+        return {provider: count for provider, count in self._provider_counts.items() if count}
+
+    def event_counts(self) -> Dict[str, int]:
+        """Number of events stored for each agent"""
+        return {agent_id: len(events) for agent_id, events in self._events.items()}
+
+    def agent_events(self) -> List[Tuple[str, List[AgentEvent]]]:
+        """Snapshot of each agent's events as AgentEvent objects"""
+        return list(self._agent_events.items())
+
+    def agent_events_between(self, start: float, end: float) -> List[Tuple[str, List[AgentEvent]]]:
+        """
+        Each agent's AgentEvents that overlap a time range, given in seconds
+        since the epoch. Events without an end time count as instants, and
+        events without a usable start time are left out.
+        """
+        result = []
+        for agent_id, agent_events in self._agent_events.items():
+            # Events are sorted by start, so only those starting before the
+            # range ends, and no earlier than the agent's longest event before
+            # it begins, can overlap it
+            sort_keys = self._sort_keys[agent_id]
+            lo = bisect_left(sort_keys, start - self._max_durations[agent_id])
+            hi = bisect_left(sort_keys, end)
+            result.append((agent_id, [
+                event for event in agent_events[lo:hi]
+                if (event.end_epoch > start if event.end_epoch is not None
+                    else event.start_epoch >= start)
+            ]))
+        return result
+
+    def iter_by_start_time(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate (agent_id, event) pairs across all agents, ordered by start time"""
+        merged = heapq.merge(
+            *(_tag_events(agent_id, events) for agent_id, events in self._agent_events.items()),
+            key=lambda item: item[0]
+        )
+        for _, agent_id, event in merged:
+            yield agent_id, event
+
+    def all_events(self) -> List[Dict[str, Any]]:
+        """
+        Copies of every agent's events ordered by start time, each with a
+        source_agent key naming the agent that reported it.
+        The list is built once per change to the store and shared between
+        callers, so it must not be modified.
+        """
+        if self._all_events is None:
+            self._all_events = [
+                dict(event, source_agent=agent_id)
+                for agent_id, event in self.iter_by_start_time()
+            ]
+        return self._all_events
@@ -5,10 +5,12 @@ This module provides storage functionality for calendar synchronization data,
 including configuration, events, and sync state.
 """
 
+import asyncio
 import json
 import logging
 import os
-from typing import Dict, List, Any, Optional
+import tempfile
+from typing import AsyncIterator, Dict, List, Any, Optional
 from datetime import datetime
 
 # Try to import aioredis, or create a minimal fallback implementation
@@ -72,11 +74,89 @@ else:
     # Replace aioredis with our dummy implementation
     aioredis = DummyAioredis()
 
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    logger.warning("aiofiles not available, file storage will use worker threads")
+    AIOFILES_AVAILABLE = False
+
 from utils.config import settings
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Streamed imports are written to disk this many events at a time
+IMPORT_WRITE_BATCH_SIZE = 1000
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _write_text(path: str, text: str, mode: str = "w") -> None:
+    with open(path, mode) as f:
+        f.write(text)
+
+
+async def _read_json(path: str, default: Any = None) -> Any:
+    """Load a JSON file without blocking the event loop, or return default if it doesn't exist"""
+    try:
+        if AIOFILES_AVAILABLE:
+            async with aiofiles.open(path, "r") as f:
+                text = await f.read()
+        else:
+            text = await asyncio.to_thread(_read_text, path)
+    except FileNotFoundError:
+        return default
+    return json.loads(text)
+
+
+async def _write_text_async(path: str, text: str, mode: str = "w") -> None:
+    """Write or append text to a file without blocking the event loop"""
+    if AIOFILES_AVAILABLE:
+        async with aiofiles.open(path, mode) as f:
+            await f.write(text)
+    else:
+        await asyncio.to_thread(_write_text, path, text, mode)
+
+
+def _temp_path(path: str) -> str:
+    """Create an empty file with a unique name next to path, to be renamed over it"""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+async def _replace_text_async(path: str, text: str) -> None:
+    """
+    Replace a file's contents without blocking the event loop.
+    The text is written to a temporary file that is then renamed over path,
+    so concurrent readers see either the old contents or the new, never a
+    partly written file.
+    """
+    tmp_path = _temp_path(path)
+    try:
+        await _write_text_async(tmp_path, text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+
+async def _write_json(path: str, data: Any, **kwargs) -> None:
+    """Write data as JSON without blocking the event loop"""
+    await _replace_text_async(path, json.dumps(data, indent=2, **kwargs))
+
 
 class SyncStorageManager:
     """
@@ -130,10 +210,7 @@ class SyncStorageManager:
         else:
             config_path = os.path.join(
                 self.file_storage_path, "sync_config.json")
-            if os.path.exists(config_path):
-                with open(config_path, "r") as f:
-                    return json.load(f)
-            return None
+            return await _read_json(config_path)
 
     async def save_sync_configuration(self, config: Dict[str, Any]) -> None:
         """Save the synchronization configuration"""
@@ -142,8 +219,7 @@ class SyncStorageManager:
         else:
             config_path = os.path.join(
                 self.file_storage_path, "sync_config.json")
-            with open(config_path, "w") as f:
-                json.dump(config, f, indent=2, default=str)
+            await _write_json(config_path, config, default=str)
 
     async def get_agent_events(self, agent_id: str) -> List[Dict[str, Any]]:
         """Get events from an agent's cache"""
@@ -153,10 +229,7 @@ class SyncStorageManager:
         else:
             events_path = os.path.join(
                 self.file_storage_path, f"agent_{agent_id}_events.json")
-            if os.path.exists(events_path):
-                with open(events_path, "r") as f:
-                    return json.load(f)
-            return []
+            return await _read_json(events_path, [])
 
     async def save_agent_events(self, agent_id: str, events: List[Dict[str, Any]]) -> None:
         """Save events from an agent to cache"""
@@ -168,8 +241,7 @@ class SyncStorageManager:
         else:
             events_path = os.path.join(
                 self.file_storage_path, f"agent_{agent_id}_events.json")
-            with open(events_path, "w") as f:
-                json.dump(events, f, indent=2, default=str)
+            await _write_json(events_path, events, default=str)
 
     async def get_import_data(self, source_id: str) -> List[Dict[str, Any]]:
         """Get import data for a source"""
@@ -179,10 +251,7 @@ class SyncStorageManager:
         else:
             import_path = os.path.join(
                 self.file_storage_path, f"import_{source_id}.json")
-            if os.path.exists(import_path):
-                with open(import_path, "r") as f:
-                    return json.load(f)
-            return []
+            return await _read_json(import_path, [])
 
     async def save_import_data(self, source_id: str, data: List[Dict[str, Any]]) -> None:
         """Save import data for a source"""
@@ -194,8 +263,42 @@ class SyncStorageManager:
         else:
             import_path = os.path.join(
                 self.file_storage_path, f"import_{source_id}.json")
-            with open(import_path, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+            await _write_json(import_path, data, default=str)
+
+    async def save_import_data_stream(self, source_id: str, events: AsyncIterator[Dict[str, Any]]) -> int:
+        """
+        Save import data for a source as it is produced, returning the number of events.
+        With file storage the events are written out in batches rather than
+        collected into one list first.
+        """
+        if self.use_redis and self.redis:
+            data = [event async for event in events]
+            await self.save_import_data(source_id, data)
+            return len(data)
+
+        import_path = os.path.join(
+            self.file_storage_path, f"import_{source_id}.json")
+        # Written under a unique temporary name so a failed import leaves the
+        # previous data in place, and concurrent imports don't interleave
+        tmp_path = _temp_path(import_path)
+        count = 0
+        pieces = ["["]
+        mode = "w"
+        try:
+            async for event in events:
+                pieces.append(("," if count else "") + "\n" + json.dumps(event, default=str))
+                count += 1
+                if len(pieces) >= IMPORT_WRITE_BATCH_SIZE:
+                    await _write_text_async(tmp_path, "".join(pieces), mode)
+                    pieces.clear()
+                    mode = "a"
+            pieces.append("\n]")
+            await _write_text_async(tmp_path, "".join(pieces), mode)
+            os.replace(tmp_path, import_path)
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+        return count
 
     async def save_sync_result(self, result: Dict[str, Any]) -> None:
         """Save the result of a sync operation"""
@@ -217,8 +320,7 @@ class SyncStorageManager:
             # Save latest result
             latest_path = os.path.join(
                 self.file_storage_path, "latest_sync.json")
-            with open(latest_path, "w") as f:
-                json.dump(result, f, indent=2, default=str)
+            await _write_json(latest_path, result, default=str)
 
             # Save to history with timestamp
             history_dir = os.path.join(self.file_storage_path, "history")
@@ -226,8 +328,7 @@ class SyncStorageManager:
                 os.makedirs(history_dir)
 
             history_path = os.path.join(history_dir, f"sync_{timestamp}.json")
-            with open(history_path, "w") as f:
-                json.dump(result, f, indent=2, default=str)
+            await _write_json(history_path, result, default=str)
 
             # Clean up old history files (keep last 100)
             history_files = sorted(
@@ -256,8 +357,7 @@ class SyncStorageManager:
             # Save latest result for this source
             latest_path = os.path.join(
                 self.file_storage_path, f"source_{source_id}_latest_sync.json")
-            with open(latest_path, "w") as f:
-                json.dump(result, f, indent=2, default=str)
+            await _write_json(latest_path, result, default=str)
 
             # Save to source history with timestamp
             history_dir = os.path.join(
@@ -266,8 +366,7 @@ class SyncStorageManager:
                 os.makedirs(history_dir)
 
             history_path = os.path.join(history_dir, f"sync_{timestamp}.json")
-            with open(history_path, "w") as f:
-                json.dump(result, f, indent=2, default=str)
+            await _write_json(history_path, result, default=str)
 
             # Clean up old history files (keep last 50)
             history_files = sorted(
@@ -284,10 +383,7 @@ class SyncStorageManager:
         else:
             latest_path = os.path.join(
                 self.file_storage_path, "latest_sync.json")
-            if os.path.exists(latest_path):
-                with open(latest_path, "r") as f:
-                    return json.load(f)
-            return None
+            return await _read_json(latest_path)
 
     async def get_latest_source_sync_result(self, source_id: str) -> Optional[Dict[str, Any]]:
         """Get the latest sync result for a specific source"""
@@ -297,10 +393,7 @@ class SyncStorageManager:
         else:
             latest_path = os.path.join(
                 self.file_storage_path, f"source_{source_id}_latest_sync.json")
-            if os.path.exists(latest_path):
-                with open(latest_path, "r") as f:
-                    return json.load(f)
-            return None
+            return await _read_json(latest_path)
 
     async def queue_agent_update(self, agent_id: str, update_data: Dict[str, Any]) -> None:
         """Queue an update for a specific agent"""
@@ -325,21 +418,16 @@ class SyncStorageManager:
 
             # Save the update
             update_path = os.path.join(updates_dir, f"update_{update_id}.json")
-            with open(update_path, "w") as f:
-                json.dump(update_data, f, indent=2, default=str)
+            await _write_json(update_path, update_data, default=str)
 
             # Maintain pending list
             pending_path = os.path.join(updates_dir, "pending.json")
-            pending_updates = []
-            if os.path.exists(pending_path):
-                with open(pending_path, "r") as f:
-                    pending_updates = json.load(f)
+            pending_updates = await _read_json(pending_path, [])
 
             if update_id not in pending_updates:
                 pending_updates.insert(0, update_id)  # Add to front
 
-            with open(pending_path, "w") as f:
-                json.dump(pending_updates, f, indent=2)
+            await _write_json(pending_path, pending_updates)
 
     async def get_pending_agent_updates(self, agent_id: str) -> List[Dict[str, Any]]:
         """Get pending updates for a specific agent"""
@@ -360,17 +448,14 @@ class SyncStorageManager:
                 self.file_storage_path, "agent_updates", agent_id)
             pending_path = os.path.join(updates_dir, "pending.json")
 
-            if os.path.exists(pending_path):
-                with open(pending_path, "r") as f:
-                    pending_ids = json.load(f)
+            pending_ids = await _read_json(pending_path, [])
 
-                # Load each update
-                for update_id in pending_ids:
-                    update_path = os.path.join(
-                        updates_dir, f"update_{update_id}.json")
-                    if os.path.exists(update_path):
-                        with open(update_path, "r") as f:
-                            updates.append(json.load(f))
+            # Load the updates concurrently, skipping any whose file is gone
+            loaded = await asyncio.gather(*(
+                _read_json(os.path.join(updates_dir, f"update_{update_id}.json"))
+                for update_id in pending_ids
+            ))
+            updates = [update for update in loaded if update is not None]
 
         return updates
 
@@ -400,15 +485,11 @@ class SyncStorageManager:
             update_path = os.path.join(updates_dir, f"update_{update_id}.json")
 
             # Remove from pending list
-            if os.path.exists(pending_path):
-                with open(pending_path, "r") as f:
-                    pending_updates = json.load(f)
-
-                if update_id in pending_updates:
-                    pending_updates.remove(update_id)
+            pending_updates = await _read_json(pending_path, [])
+            if update_id in pending_updates:
+                pending_updates.remove(update_id)
 
-                    with open(pending_path, "w") as f:
-                        json.dump(pending_updates, f, indent=2)
+                await _write_json(pending_path, pending_updates)
 
             # Move to processed directory
             if os.path.exists(update_path):
@@ -417,15 +498,13 @@ class SyncStorageManager:
                     os.makedirs(processed_dir)
 
                 # Add processed timestamp
-                with open(update_path, "r") as f:
-                    update_data = json.load(f)
+                update_data = await _read_json(update_path)
 
                 update_data["processed_at"] = datetime.utcnow().isoformat()
 
                 processed_path = os.path.join(
                     processed_dir, f"update_{update_id}.json")
-                with open(processed_path, "w") as f:
-                    json.dump(update_data, f, indent=2, default=str)
+                await _write_json(processed_path, update_data, default=str)
 
                 # Remove original update file
                 os.remove(update_path)
@@ -88,6 +88,9 @@ class Settings(BaseSettings):
     # Sync settings
     SYNC_INTERVAL_MINUTES: int = 5
     SYNC_ENABLED: bool = True
+    # Events kept per agent; over the cap, events without a start time are
+    # dropped first, then the earliest, so the latest events are kept
+    MAX_STORED_EVENTS_PER_AGENT: int = 10000
 
     # MCP settings
     MCP_SERVICE_NAME: str = "Calendar Integration Service"
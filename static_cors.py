@@ -0,0 +1,69 @@
+"""
+Minimal CORS middleware for the standalone servers, which allow every origin.
+
+Starlette's CORSMiddleware re-checks its origin, method and header rules on
+every request. When everything is allowed the answer never changes, so the
+headers are built once at import and appended to the response as-is.
+Requests without an Origin header (the calendar agents) pass straight through.
+"""
+
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+_MAX_AGE = b"600"
+
+# Headers added to every cross-origin response. The origin itself is echoed
+# back rather than "*" because browsers reject "*" on credentialed requests.
+_STATIC_CORS_HEADERS = [
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+]
+
+_PREFLIGHT_HEADERS = _STATIC_CORS_HEADERS + [
+    (b"access-control-allow-methods", _ALLOW_METHODS),
+    (b"access-control-max-age", _MAX_AGE),
+    (b"content-length", b"0"),
+]
+
+
+class StaticCORSMiddleware:
+    """ASGI middleware that allows all origins, methods and headers"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        preflight = False
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                preflight = True
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if preflight and scope["method"] == "OPTIONS":
+            headers = [(b"access-control-allow-origin", origin)] + _PREFLIGHT_HEADERS
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"access-control-allow-origin", origin))
+                headers.extend(_STATIC_CORS_HEADERS)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
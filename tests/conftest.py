@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The application imports its packages (services, sync, api, ...) relative to
+# src, and the standalone servers live at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
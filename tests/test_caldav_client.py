@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+import pytest
+from icalendar import Calendar
+
+import services.caldav_client as caldav_client
+from services.caldav_client import _build_event_ics
+
+EVENT_DATA = {
+    "title": "Planning; budget, Q3",
+    "description": "Line one\nLine two with a long tail " + "x" * 80,
+    "location": "Room 4",
+    "start_time": "2024-03-01T09:00:00Z",
+    "end_time": "2024-03-01T09:30:00Z",
+}
+NOW = datetime(2024, 2, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def parse_event(body):
+    """Parse an iCalendar body and return its single VEVENT"""
+    events = Calendar.from_ical(body).walk("VEVENT")
+    assert len(events) == 1
+    return events[0]
+
+
+@pytest.mark.parametrize("use_template", [True, False])
+def test_build_event_ics(monkeypatch, use_template):
+    """Test the event body built from the template and through icalendar"""
+    monkeypatch.setattr(caldav_client, "USE_ICS_TEMPLATE", use_template)
+
+    body = _build_event_ics("event-1@example.com", EVENT_DATA, NOW)
+
+    assert all(len(line) <= 75 for line in body.split(b"\r\n"))
+    event = parse_event(body)
+    assert str(event["UID"]) == "event-1@example.com"
+    assert str(event["SUMMARY"]) == EVENT_DATA["title"]
+    assert str(event["DESCRIPTION"]) == EVENT_DATA["description"]
+    assert str(event["LOCATION"]) == "Room 4"
+    assert event.decoded("DTSTART") == datetime(2024, 3, 1, 9, 0, tzinfo=timezone.utc)
+    assert event.decoded("DTEND") == datetime(2024, 3, 1, 9, 30, tzinfo=timezone.utc)
+    assert event.decoded("DTSTAMP") == NOW
+
+
+def test_build_event_ics_keeps_created():
+    """Test that an existing CREATED property is preserved"""
+    created = parse_event(_build_event_ics("event-1", EVENT_DATA, NOW))["CREATED"]
+    later = datetime(2024, 2, 2, tzinfo=timezone.utc)
+
+    event = parse_event(_build_event_ics("event-1", EVENT_DATA, later, created))
+
+    assert event.decoded("CREATED") == NOW
+    assert event.decoded("LAST-MODIFIED") == later
@@ -0,0 +1,139 @@
+import pytest
+
+from sync.event_store import EventStore, _epoch
+
+
+def make_event(event_id, start=None, end=None, provider="google"):
+    """Build an event dict the way agents report them"""
+    event = {"id": event_id, "title": f"Event {event_id}", "provider": provider}
+    if start is not None:
+        event["start_time"] = start
+    if end is not None:
+        event["end_time"] = end
+    return event
+
+
+@pytest.fixture
+def store():
+    """Create an empty, uncapped event store"""
+    return EventStore()
+
+
+def test_events_are_stored_sorted_by_start_time(store):
+    """Test that an agent's events are kept ordered by start time"""
+    store["agent-1"] = [
+        make_event("b", "2024-01-02T09:00:00+00:00"),
+        make_event("a", "2024-01-01T09:00:00+00:00"),
+        make_event("c", "2024-01-02T10:00:00+02:00"),
+    ]
+
+    # 10:00+02:00 is 08:00 UTC, so it comes before 09:00 UTC on the same day
+    assert [e["id"] for e in store["agent-1"]] == ["a", "c", "b"]
+
+
+def test_totals_follow_replacements_and_deletes(store):
+    """Test the running event and provider totals"""
+    store["agent-1"] = [make_event("a"), make_event("b", provider="microsoft")]
+    store["agent-2"] = [make_event("c")]
+    assert store.total_events == 3
+    assert store.provider_counts() == {"google": 2, "microsoft": 1}
+    assert store.event_counts() == {"agent-1": 2, "agent-2": 1}
+
+    store["agent-1"] = [make_event("d", provider="microsoft")]
+    assert store.total_events == 2
+    assert store.provider_counts() == {"google": 1, "microsoft": 1}
+
+    del store["agent-2"]
+    assert store.total_events == 1
+    assert store.provider_counts() == {"microsoft": 1}
+
+    store.clear()
+    assert store.total_events == 0
+    assert store.provider_counts() == {}
+
+
+def test_failed_replace_keeps_previous_events(store):
+    """Test that a payload that can't be stored leaves the store unchanged"""
+    store["agent-1"] = [make_event("a")]
+    version = store.version
+
+    for bad_events in (5, {"id": "b"}, [make_event("b", provider=["unhashable"])]):
+        with pytest.raises(TypeError):
+            store["agent-1"] = bad_events
+
+    assert [e["id"] for e in store["agent-1"]] == ["a"]
+    assert store.total_events == 1
+    assert store.provider_counts() == {"google": 1}
+    assert store.version == version
+
+
+def test_non_object_events_are_skipped(store):
+    """Test that items that aren't event objects are left out"""
+    store["agent-1"] = [make_event("a")]
+
+    store["agent-1"] = ["x", make_event("b"), None]
+    assert [e["id"] for e in store["agent-1"]] == ["b"]
+    assert store.total_events == 1
+
+    store["agent-1"] = ["x"]
+    assert store["agent-1"] == []
+    assert store.total_events == 0
+    assert store.provider_counts() == {}
+
+
+def test_cap_keeps_latest_events():
+    """Test that the per-agent cap drops undated events, then the earliest"""
+    store = EventStore(max_events_per_agent=2)
+    store["agent-1"] = [
+        make_event("undated"),
+        make_event("2024", "2024-01-01T00:00:00Z"),
+        make_event("2026", "2026-01-01T00:00:00Z"),
+        make_event("2025", "2025-01-01T00:00:00Z"),
+    ]
+
+    assert [e["id"] for e in store["agent-1"]] == ["2025", "2026"]
+    assert store.total_events == 2
+
+
+def test_epoch_accepts_trailing_z():
+    """Test that Z-suffixed and naive times are both read as UTC"""
+    assert _epoch("2024-01-01T00:00:00Z") == 1704067200.0
+    assert _epoch("2024-01-01T00:00:00") == 1704067200.0
+    assert _epoch("not a time") is None
+    assert _epoch(None) is None
+
+
+def test_agent_events_between_returns_overlapping_events(store):
+    """Test the time range lookup, including events that start before it"""
+    store["agent-1"] = [
+        make_event("before", "2024-01-01T00:00:00Z", "2024-01-01T01:00:00Z"),
+        make_event("long", "2024-01-01T00:00:00Z", "2024-01-03T00:00:00Z"),
+        make_event("inside", "2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z"),
+        make_event("instant", "2024-01-02T12:00:00Z"),
+        make_event("after", "2024-01-04T00:00:00Z", "2024-01-04T01:00:00Z"),
+        make_event("undated"),
+    ]
+    store["agent-2"] = []
+
+    start = _epoch("2024-01-02T00:00:00Z")
+    end = _epoch("2024-01-03T00:00:00Z")
+    result = dict(store.agent_events_between(start, end))
+
+    assert [e.id for e in result["agent-1"]] == ["long", "inside", "instant"]
+    assert result["agent-2"] == []
+
+
+def test_all_events_merges_agents_by_start_time(store):
+    """Test the merged, agent-tagged event list"""
+    store["agent-1"] = [make_event("a", "2024-01-01T00:00:00Z"),
+                        make_event("c", "2024-01-03T00:00:00Z")]
+    store["agent-2"] = [make_event("b", "2024-01-02T00:00:00Z")]
+
+    merged = store.all_events()
+    assert [(e["id"], e["source_agent"]) for e in merged] == [
+        ("a", "agent-1"), ("b", "agent-2"), ("c", "agent-1")]
+    # Shared until the store changes
+    assert store.all_events() is merged
+
+    store["agent-2"] = []
+    assert [e["id"] for e in store.all_events()] == ["a", "c"]
@@ -0,0 +1,137 @@
+import pytest
+from googleapiclient.errors import HttpError
+from tenacity import wait_none
+
+import services.google_calendar as google_calendar
+from services.google_calendar import GoogleCalendarService
+
+
+@pytest.fixture
+def google_service():
+    """Create a GoogleCalendarService running without API credentials"""
+    service = GoogleCalendarService()
+    service.auth.dummy_mode = True
+    return service
+
+
+@pytest.mark.asyncio
+async def test_create_events_in_dummy_mode(google_service):
+    """Test that batched creates work against the dummy service"""
+    events_data = [{"summary": f"Event {i}"} for i in range(3)]
+
+    created = await google_service.create_events({}, "primary", events_data)
+
+    assert created == [{"id": "dummy-event-id"}] * 3
+
+
+class FakeResponse(dict):
+    """Minimal httplib2-style response carrying an HTTP status"""
+
+    def __init__(self, status):
+        super().__init__(status=str(status))
+        self.status = status
+        self.reason = "error"
+
+
+def http_error(status):
+    return HttpError(FakeResponse(status), b"")
+
+
+class FakeInsert:
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeEvents:
+    def insert(self, calendarId, body):
+        return FakeInsert(body)
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append([request.body["summary"] for _, request in self.requests])
+        if self.service.batch_failures:
+            raise self.service.batch_failures.pop(0)
+        for request_id, request in self.requests:
+            failures = self.service.item_failures.get(request.body["summary"])
+            if failures:
+                self.callback(request_id, None, failures.pop(0))
+            else:
+                self.callback(request_id, {"id": request.body["summary"]}, None)
+
+
+class FakeCalendarService:
+    """Calendar service whose batch calls and inserts fail as scripted"""
+
+    def __init__(self, batch_failures=(), item_failures=None):
+        self.batch_failures = list(batch_failures)
+        self.item_failures = item_failures or {}
+        self.batches = []
+
+    def events(self):
+        return FakeEvents()
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+@pytest.fixture
+def fake_service(google_service, monkeypatch):
+    """Install a scripted calendar service and skip retry waits"""
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(google_calendar.asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(GoogleCalendarService._execute_batch.retry, "wait", wait_none())
+
+    def install(service):
+        async def get_calendar_service(token_info):
+            return service
+        monkeypatch.setattr(google_service.auth, "get_calendar_service", get_calendar_service)
+        return service
+
+    return install
+
+
+@pytest.mark.asyncio
+async def test_create_events_retries_failed_batch_call(google_service, fake_service):
+    """Test that a transient failure of the batch call itself is retried"""
+    service = fake_service(FakeCalendarService(batch_failures=[http_error(503)]))
+
+    created = await google_service.create_events({}, "primary", [{"summary": "a"}, {"summary": "b"}])
+
+    assert created == [{"id": "a"}, {"id": "b"}]
+    assert service.batches == [["a", "b"], ["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_create_events_resends_only_retryable_failures(google_service, fake_service):
+    """Test that only inserts that failed with retryable errors are sent again"""
+    service = fake_service(FakeCalendarService(item_failures={
+        "b": [http_error(429)],
+        "c": [http_error(400)],
+    }))
+
+    created = await google_service.create_events(
+        {}, "primary", [{"summary": "a"}, {"summary": "b"}, {"summary": "c"}])
+
+    assert created == [{"id": "a"}, {"id": "b"}, None]
+    assert service.batches == [["a", "b", "c"], ["b"]]
+
+
+@pytest.mark.asyncio
+async def test_create_events_reports_batch_that_keeps_failing(google_service, fake_service):
+    """Test that a batch call that keeps failing fails its events, not the whole call"""
+    fake_service(FakeCalendarService(batch_failures=[http_error(400)]))
+
+    created = await google_service.create_events({}, "primary", [{"summary": "a"}])
+
+    assert created == [None]
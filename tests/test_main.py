@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+import main
+from main import AppJSONResponse
+
+
+def test_json_response_accepts_non_str_keys():
+    """Test that int and None dict keys are written as strings, like the stdlib encoder"""
+    response = AppJSONResponse({1: "a", None: "b", "c": {2: True}})
+
+    assert response.body == b'{"1":"a","null":"b","c":{"2":true}}'
+
+
+def test_health_uses_app_json_response():
+    """Test that routes without their own response class use AppJSONResponse"""
+    assert main.app.router.default_response_class is AppJSONResponse
+
+    with TestClient(main.app) as client:
+        response = client.get("/health")
+
+    assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from static_cors import StaticCORSMiddleware
+
+
+@pytest.fixture
+def client():
+    """Create a test client for a small app behind StaticCORSMiddleware"""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    app.add_middleware(StaticCORSMiddleware)
+    return TestClient(app)
+
+
+def test_request_without_origin_passes_through(client):
+    """Test that agent requests get no CORS headers"""
+    response = client.get("/ping")
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_cross_origin_request_echoes_origin(client):
+    """Test the CORS headers added to a cross-origin response"""
+    response = client.get("/ping", headers={"Origin": "https://app.example.com"})
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert response.headers["access-control-allow-origin"] == "https://app.example.com"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_preflight_is_answered_directly(client):
+    """Test that a preflight request gets a 204 allowing the requested headers"""
+    response = client.options("/ping", headers={
+        "Origin": "https://app.example.com",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type, x-api-key",
+    })
+
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == "https://app.example.com"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["access-control-allow-headers"] == "content-type, x-api-key"
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.sync_router as sync_router
+from sync.controller import CalendarSyncController
+from sync.storage import SyncStorageManager
+
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch):
+    """Create a sync controller backed by file storage in a temporary directory"""
+    monkeypatch.setenv("STORAGE_PATH", str(tmp_path))
+    return CalendarSyncController(SyncStorageManager(use_redis=False))
+
+
+@pytest.fixture
+def client(controller):
+    """Create a test client for an app serving the sync router"""
+    app = FastAPI()
+    app.include_router(sync_router.router)
+    app.state.sync_controller = controller
+    sync_router.stored_events.clear()
+    with TestClient(app) as client:
+        yield client
+    sync_router.stored_events.clear()
+
+
+def test_heartbeat_stores_events(client):
+    """Test a heartbeat carrying events"""
+    response = client.post("/sync/agents/agent-1/heartbeat", json={
+        "status": "active",
+        "events": [{"id": "a", "start_time": "2024-01-01T09:00:00Z"}]
+    })
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+    assert [e["id"] for e in sync_router.stored_events["agent-1"]] == ["a"]
+
+
+def test_heartbeat_rejects_body_that_is_not_an_object(client):
+    """Test that a heartbeat body must be a JSON object"""
+    for body in (b"[]", b"not json"):
+        response = client.post("/sync/agents/agent-1/heartbeat", content=body)
+        assert response.status_code == 422
+
+    assert "agent-1" not in sync_router.stored_events
+
+
+def test_heartbeat_with_bad_events_keeps_previous_events(client):
+    """Test that events that can't be stored give a 400 and change nothing"""
+    client.post("/sync/agents/agent-1/heartbeat", json={"events": [{"id": "a"}]})
+
+    response = client.post("/sync/agents/agent-1/heartbeat", json={"events": 5})
+
+    assert response.status_code == 400
+    assert [e["id"] for e in sync_router.stored_events["agent-1"]] == ["a"]
+    assert sync_router.stored_events.total_events == 1
+
+
+def test_config_etag_returns_not_modified(client):
+    """Test that a matching If-None-Match gets a 304"""
+    response = client.get("/sync/config")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    # Weak, since compression may change the bytes sent under the tag
+    assert etag.startswith('W/"')
+
+    response = client.get("/sync/config", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    # Weak comparison also matches the tag without its W/ prefix
+    response = client.get("/sync/config", headers={"If-None-Match": f'"x", {etag[2:]}'})
+    assert response.status_code == 304
+
+    response = client.get("/sync/config", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_import_streams_events_to_storage(client, tmp_path):
+    """Test that imported events with an ID are written to the source's import file"""
+    events = [{"id": "a", "title": "A"}, {"title": "no id"}, "x", {"id": "b"}]
+
+    response = client.post("/sync/import/source-1", content=json.dumps(events))
+
+    assert response.status_code == 200
+    assert response.json()["events_imported"] == 2
+    with open(tmp_path / "import_source-1.json") as f:
+        assert [e["id"] for e in json.load(f)] == ["a", "b"]
+    assert [p.name for p in tmp_path.glob("*.tmp")] == []